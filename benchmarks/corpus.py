@@ -0,0 +1,77 @@
+# benchmarks/corpus.py
+"""
+Synthetic PDF corpus for the benchmarks.
+
+    python -m benchmarks.corpus --out benchmarks/corpus --docs 20 --pages 30
+
+Documents are generated deterministically from a seed, so two runs of the benchmark with
+the same arguments process byte-identical files.
+"""
+
+import argparse
+import os
+import random
+
+VOCABULARY = (
+    "spacecraft orbit trajectory propulsion thermal radiation microgravity regolith lunar martian "
+    "habitat telemetry payload sensor instrument spectrometer cryogenic composite structure launch "
+    "vehicle mission analysis experiment crew exposure dosimetry shielding plasma magnetosphere "
+    "atmosphere entry descent landing navigation guidance control antenna bandwidth attenuation "
+    "results indicate significant increase decrease measured observed model simulation validation "
+    "the of and in to a for with on by from was were is are this that these data samples"
+).split()
+WORDS_PER_PAGE = 450
+
+
+def synthetic_text(rng, n_words):
+    """Sentence-like text: capitalised runs of 8-20 vocabulary words ending in a full stop."""
+    sentences = []
+    while n_words > 0:
+        length = min(n_words, rng.randint(8, 20))
+        words = [rng.choice(VOCABULARY) for _ in range(length)]
+        sentences.append(" ".join(words).capitalize() + ".")
+        n_words -= length
+    return " ".join(sentences)
+
+
+def make_pdf(n_pages, seed=0, words_per_page=WORDS_PER_PAGE):
+    """Returns the bytes of a PDF with n_pages pages of synthetic text."""
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for page_number in range(n_pages):
+        page = doc.new_page()
+        text = f"Page {page_number + 1}\n\n" + synthetic_text(rng, words_per_page)
+        page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), text, fontsize=8)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def write_corpus(out_dir, n_docs=10, n_pages=20, seed=0):
+    """Writes n_docs PDFs into out_dir (skipping files that already exist) and returns their paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(n_docs):
+        path = os.path.join(out_dir, f"synthetic_{seed}_{i:04d}_{n_pages}p.pdf")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(make_pdf(n_pages, seed=seed * 100003 + i))
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic PDF corpus.")
+    parser.add_argument("--out", default=os.path.join("benchmarks", "corpus"))
+    parser.add_argument("--docs", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    paths = write_corpus(args.out, args.docs, args.pages, args.seed)
+    print(f"📄 {len(paths)} PDFs in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+# benchmarks/mock_server.py
+"""
+Local stand-in for NSLSL, NTRS and the Gemini REST API.
+
+    python -m benchmarks.mock_server --port 8765 --latency nslsl=0.2,gemini=1.5
+
+Point the app at it with
+    NSLSL_SEARCH_URL=http://127.0.0.1:8765/NSLSL/Search
+    NTRS_SEARCH_URL=http://127.0.0.1:8765/ntrs/search
+    GEMINI_API_BASE=http://127.0.0.1:8765
+
+Pages are synthetic HTML that matches the selectors the scrapers use. Recorded pages can
+be replayed instead by saving them in a fixtures directory as nslsl_search.html,
+nslsl_results.html, nslsl_detail.html and ntrs_search.html. Every response is delayed by
+the latency configured for its service (seconds, plus up to `jitter` times that at random).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.corpus import make_pdf, synthetic_text
+
+DEFAULT_LATENCY = {"nslsl": 0.0, "ntrs": 0.0, "gemini": 0.0}
+RESULTS_PER_SEARCH = 10
+PDF_PAGES = 12
+# Streamed Gemini responses are split into this many SSE chunks, each delayed by latency / chunks.
+STREAM_CHUNKS = 5
+
+# Structured answers in the shape of the app's response schemas (engine/structured_output.py).
+CANNED_DISTRIBUTION = [
+    {"area": "Propulsion", "score": 90}, {"area": "Thermal Protection", "score": 70},
+    {"area": "Guidance and Navigation", "score": 55}, {"area": "Materials", "score": 40}, {"area": "Life Support", "score": 25},
+]
+CANNED_GRAPH = {
+    "nodes": [
+        {"id": "mission", "label": "Mission Design"},
+        {"id": "propulsion", "label": "Propulsion"},
+        {"id": "thermal", "label": "Thermal Protection"},
+        {"id": "navigation", "label": "Navigation"},
+    ],
+    "edges": [
+        {"source": "mission", "target": "propulsion"},
+        {"source": "mission", "target": "thermal"},
+        {"source": "propulsion", "target": "navigation"},
+    ],
+}
+
+
+def _canned_text(prompt, rng):
+    """Picks a canned answer by recognising which of the app's prompts was sent."""
+    if "research briefing" in prompt:
+        return json.dumps({
+            "summary": "### Summary\n\n" + synthetic_text(rng, 180),
+            "distribution": CANNED_DISTRIBUTION,
+            "graph": CANNED_GRAPH,
+            "actionable": {"mission_architects": synthetic_text(rng, 20), "scientists": synthetic_text(rng, 20), "managers": synthetic_text(rng, 20)},
+        })
+    if "scientific research analyst" in prompt:
+        return json.dumps(CANNED_DISTRIBUTION)
+    if "knowledge graph specialist" in prompt:
+        return json.dumps(CANNED_GRAPH)
+    return "### Summary\n\n" + synthetic_text(rng, 180)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- Plumbing ---
+    def _delay(self, service, fraction=1.0):
+        latency = self.server.latency.get(service, 0.0) * fraction
+        if latency:
+            time.sleep(latency * (1 + self.server.jitter * random.random()))
+        self.server.count(service)
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _fixture(self, name):
+        if self.server.fixtures_dir:
+            path = os.path.join(self.server.fixtures_dir, name)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.read()
+        return None
+
+    # --- Routing ---
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def _route(self, method):
+        path = urlsplit(self.path).path
+        body = self._read_body() if method == "POST" else b""
+        if path == "/NSLSL/Search":
+            self._delay("nslsl")
+            return self._send(200, self._fixture("nslsl_search.html") or self.server.nslsl_search_page())
+        if path == "/NSLSL/Search/Results":
+            self._delay("nslsl")
+            return self._send(200, self._fixture("nslsl_results.html") or self.server.nslsl_results_page(body))
+        match = re.fullmatch(r"/NSLSL/Search/DetailsForID/(\d+)", path)
+        if match:
+            self._delay("nslsl")
+            return self._send(200, self._fixture("nslsl_detail.html") or self.server.nslsl_detail_page(int(match.group(1))))
+        match = re.fullmatch(r"/NSLSL/Search/Download/(\d+)", path)
+        if match:
+            self._delay("nslsl")
+            pdf_bytes = self.server.pdf(int(match.group(1)))
+            etag = '"' + hashlib.sha256(pdf_bytes).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", headers={"ETag": etag})
+            return self._send(200, pdf_bytes, "application/pdf", {"ETag": etag})
+        if path == "/ntrs/search":
+            self._delay("ntrs")
+            return self._send(200, self._fixture("ntrs_search.html") or self.server.ntrs_search_page())
+        match = re.fullmatch(r"/v1(?:beta)?/models/([^:]+):(generateContent|streamGenerateContent)", path)
+        if match and method == "POST":
+            return self._gemini(json.loads(body or b"{}"), stream=match.group(2) == "streamGenerateContent")
+        self._send(404, "Not found", "text/plain")
+
+    def _gemini(self, payload, stream):
+        prompt = " ".join(
+            part.get("text", "") for content in payload.get("contents", []) for part in content.get("parts", [])
+        )
+        text = _canned_text(prompt, random.Random(len(prompt)))
+        if not stream:
+            self._delay("gemini")
+            response = {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+            return self._send(200, json.dumps(response), "application/json")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        step = max(1, len(text) // STREAM_CHUNKS + 1)
+        for start in range(0, len(text), step):
+            self._delay("gemini", 1.0 / STREAM_CHUNKS)
+            chunk = {"candidates": [{"content": {"parts": [{"text": text[start:start + step]}], "role": "model"}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode("utf-8"))
+            self.wfile.flush()
+        self.close_connection = True
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded mock server; use start()/stop() to run it in the background of a benchmark."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=None, jitter=0.0, fixtures_dir=None,
+                 results_per_search=RESULTS_PER_SEARCH, pdf_pages=PDF_PAGES):
+        super().__init__((host, port), MockHandler)
+        self.latency = dict(DEFAULT_LATENCY, **(latency or {}))
+        self.jitter = jitter
+        self.fixtures_dir = fixtures_dir
+        self.results_per_search = results_per_search
+        self.pdf_pages = pdf_pages
+        self.requests = {}
+        self._pdfs = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def count(self, service):
+        with self._lock:
+            self.requests[service] = self.requests.get(service, 0) + 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    # --- Synthetic content ---
+    def pdf(self, doc_id):
+        with self._lock:
+            if doc_id not in self._pdfs:
+                self._pdfs[doc_id] = make_pdf(self.pdf_pages, seed=doc_id)
+            return self._pdfs[doc_id]
+
+    def nslsl_search_page(self):
+        return """<html><body>
+<form action="/NSLSL/Search/Results" method="post">
+  <input type="hidden" name="__RequestVerificationToken" value="benchmark-token">
+  <input type="text" id="searchCriteria" name="searchCriteria">
+  <button id="btnSearchSimple" name="btnSearch" value="Search">Search</button>
+</form></body></html>"""
+
+    def nslsl_results_page(self, body):
+        term = parse_qs(body.decode("utf-8", "replace")).get("searchCriteria", ["benchmark"])[0]
+        seed = int(hashlib.sha256(term.encode("utf-8")).hexdigest()[:6], 16)
+        links = "\n".join(
+            f'<li><a class="pubDetail" href="/NSLSL/Search/DetailsForID/{seed + i}">{escape(term.title())} study {i + 1}</a></li>'
+            for i in range(self.results_per_search)
+        )
+        return f"""<html><body><div>{self.results_per_search} results</div>
+<ul id="searchResultList">{links}</ul></body></html>"""
+
+    def nslsl_detail_page(self, doc_id):
+        abstract = synthetic_text(random.Random(doc_id), 120)
+        return f"""<html><body><h6 class="detailSubHeader">Abstract</h6>
+<span id="abstract-1">{escape(abstract)}</span>
+<h6 class="detailSubHeader">Attachments</h6>
+<ul><li><a href="/NSLSL/Search/Download/{doc_id}">document_{doc_id}.pdf</a></li></ul></body></html>"""
+
+    def ntrs_search_page(self):
+        cards = "\n".join(
+            f'<app-card-list-item><h6><a href="/ntrs/citations/{i}">NTRS benchmark record {i}</a></h6></app-card-list-item>'
+            for i in range(self.results_per_search)
+        )
+        return f"""<html><body><input id="search-input" type="text">{cards}</body></html>"""
+
+
+def parse_latency(value):
+    """Parses 'nslsl=0.2,gemini=1.5' into {'nslsl': 0.2, 'gemini': 1.5}."""
+    latency = {}
+    for item in filter(None, (value or "").split(",")):
+        service, _, seconds = item.partition("=")
+        latency[service.strip()] = float(seconds)
+    return latency
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve local stand-ins for NSLSL, NTRS and Gemini.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=parse_latency, default={}, help="Per-service latency, e.g. nslsl=0.2,gemini=1.5")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency as a fraction of the base latency.")
+    parser.add_argument("--fixtures", help="Directory with recorded HTML pages to replay.")
+    args = parser.parse_args(argv)
+
+    server = MockServer(args.host, args.port, args.latency, args.jitter, args.fixtures)
+    print(f"🧪 Mock NSLSL/NTRS/Gemini server on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+# benchmarks/run.py
+"""
+Benchmark harness: runs the app's hot paths against the local mock server and a synthetic
+PDF corpus, and writes per-stage timings and memory peaks as JSON.
+
+    python -m benchmarks.run --repeat 5 --latency nslsl=0.05,gemini=0.5 --output bench.json
+    python -m benchmarks.run --baseline bench.json --tolerance 0.25   # exit 1 on regressions
+
+Every cache, index and database lives in a throw-away working directory, so runs do not
+touch ./cache and start from the same state. Stages that cannot run here (for example a
+missing optional dependency) are reported with their error instead of aborting the run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+from benchmarks.corpus import synthetic_text, write_corpus
+from benchmarks.mock_server import MockServer, parse_latency
+from benchmarks.startup import profile_imports
+
+# Functions in app.py whose time is reported as a breakdown of the stage that calls them.
+APP_SUBSTAGES = (
+    "scrape_nslsl_search_results", "get_abstracts_from_results", "fetch_nslsl_pdf",
+    "get_text_summary_dash", "get_research_distribution", "get_knowledge_graph_data", "get_fused_analysis", "get_pdf_summary_dash",
+)
+SUMMARY_LENGTH = "executive summary (200 words)"
+
+
+class BenchmarkContext:
+    """Shared state of one benchmark run: working directory, mock server, corpus, lazily imported modules."""
+
+    def __init__(self, workdir, server, corpus_dir):
+        self.workdir = workdir
+        self.server = server
+        self.corpus_dir = corpus_dir
+        self.breakdown = {}
+        self._breakdown_lock = threading.Lock()
+        self._app = None
+
+    @property
+    def app(self):
+        """Imports app.py with its sub-stages instrumented (the import itself is not timed)."""
+        if self._app is None:
+            import app
+            for name in APP_SUBSTAGES:
+                setattr(app, name, self._instrument(name, getattr(app, name)))
+            self._app = app
+        return self._app
+
+    def _instrument(self, name, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._breakdown_lock:
+                    self.breakdown[name] = self.breakdown.get(name, 0.0) + time.perf_counter() - start
+        return timed
+
+
+def configure_environment(workdir, server):
+    """Points every cache and external service of the app at the working directory and the mock server."""
+    env = {
+        "NSLSL_SEARCH_URL": f"{server.base_url}/NSLSL/Search",
+        "NTRS_SEARCH_URL": f"{server.base_url}/ntrs/search",
+        "GEMINI_API_BASE": server.base_url,
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm.sqlite3"),
+        "PDF_TEXT_CACHE_DIR": os.path.join(workdir, "pdf_text"),
+        "SEARCH_INDEX_PATH": os.path.join(workdir, "search_index.sqlite3"),
+        "VECTOR_INDEX_DIR": os.path.join(workdir, "vectors"),
+        "SESSION_STORE_PATH": os.path.join(workdir, "sessions.sqlite3"),
+        "JOB_QUEUE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "DOCUMENT_STORE_PATH": os.path.join(workdir, "documents.sqlite3"),
+        "DOWNLOAD_CACHE_DIR": os.path.join(workdir, "downloads"),
+    }
+    os.environ.update(env)
+    return env
+
+
+# --- Stages: each callable runs one iteration; setup (if any) runs once, untimed ---
+def stage_app_import(ctx, run):
+    """`import app` in a fresh interpreter (what a new worker pays before serving the landing page)."""
+    report = profile_imports("app")
+    if report["deferred_packages_imported"]:
+        raise RuntimeError("imported at start-up: " + ", ".join(report["deferred_packages_imported"]))
+    for name, seconds in list(report["packages_seconds"].items())[:5]:
+        ctx.breakdown[f"import {name}"] = seconds
+    return report["total_seconds"]
+
+
+def stage_extract_text_cold(ctx, run):
+    from engine.processing import extract_text_from_pdfs
+    shutil.rmtree(os.environ["PDF_TEXT_CACHE_DIR"], ignore_errors=True)
+    os.makedirs(os.environ["PDF_TEXT_CACHE_DIR"])
+    return len(extract_text_from_pdfs(ctx.corpus_dir))
+
+
+def stage_extract_text_warm(ctx, run):
+    from engine.processing import extract_text_from_pdfs
+    return len(extract_text_from_pdfs(ctx.corpus_dir))
+
+
+def stage_search_job_cold(ctx, run):
+    """The work behind search_topic for a term that no cache has seen."""
+    result = ctx.app.run_search_job({"search_value": f"benchmark topic {uuid.uuid4().hex[:8]}"}, lambda *args: None)
+    return len((result.get("scraped_results") or {}).get("documents", []))
+
+
+def stage_search_job_warm(ctx, run):
+    """The same search repeated, served from the LLM cache and the download/index caches."""
+    result = ctx.app.run_search_job({"search_value": "benchmark topic warm"}, lambda *args: None)
+    return len((result.get("scraped_results") or {}).get("documents", []))
+
+
+def stage_search_job_fused(ctx, run):
+    """search_job_cold with FUSED_ANALYSIS: one structured Gemini call instead of three."""
+    result = ctx.app.run_search_job({"search_value": f"benchmark topic {uuid.uuid4().hex[:8]}", "fused": True}, lambda *args: None)
+    return len((result.get("scraped_results") or {}).get("documents", []))
+
+
+def setup_search_job_warm(ctx):
+    stage_search_job_warm(ctx, -1)
+
+
+def stage_document_summary(ctx, run):
+    """The work behind handle_document_click_and_summarize after the browser found the PDF link: download + Gemini summary."""
+    from engine.downloads import get_default_manager
+    doc_id = 500000 + run  # a new document every run, so neither the download nor the LLM cache helps
+    path = get_default_manager().download(f"{ctx.server.base_url}/NSLSL/Search/Download/{doc_id}", label="benchmark.pdf")
+    with open(path, "rb") as f:
+        pdf_bytes = f.read()
+    summary, status = ctx.app.get_pdf_summary_dash(pdf_bytes, os.path.basename(path), SUMMARY_LENGTH, ctx.app.GEMINI_API_KEY)
+    if status != "success":
+        raise RuntimeError(summary)
+    return len(summary)
+
+
+def stage_curated_dashboards(ctx, run):
+    """router() for the landing page and every curated subtopic selection and dashboard."""
+    app = ctx.app
+    states = [{'view': 'landing'}]
+    for main_topic, topic in app.MOCK_DATA.items():
+        if 'subtopics' in topic:
+            states.append({'view': 'subtopic_selection', 'main_topic': main_topic})
+            states.extend({'view': 'dashboard', 'main_topic': main_topic, 'subtopic': sub} for sub in topic['subtopics'])
+        else:
+            states.append({'view': 'dashboard', 'main_topic': main_topic, 'subtopic': topic['default_subtopic']})
+    for state in states:
+        app.router(state)
+    return len(states)
+
+
+def setup_knowledge_base(ctx):
+    from engine.search_index import index_documents
+    rng = random.Random(0)
+    index_documents(
+        [{"url": f"{ctx.server.base_url}/NSLSL/Search/DetailsForID/{i}", "title": synthetic_text(rng, 8), "abstract": synthetic_text(rng, 150)}
+         for i in range(2000)]
+    )
+
+
+def stage_knowledge_base_search(ctx, run):
+    """run_master_pipeline on the local BM25 index (2,000 synthetic documents)."""
+    from engine.master_engine import run_master_pipeline
+    return len(run_master_pipeline("thermal radiation shielding")["experiments"])
+
+
+def stage_ntrs_live_pipeline(ctx, run):
+    """run_master_pipeline with live_scrape=True: headless Chrome against the mock NTRS page, then the NLP models."""
+    from engine.master_engine import run_master_pipeline
+    return len(run_master_pipeline("benchmark", live_scrape=True)["summary"])
+
+
+STAGES = {
+    "app_import": (None, stage_app_import),
+    "extract_text_cold": (None, stage_extract_text_cold),
+    "extract_text_warm": (None, stage_extract_text_warm),
+    "search_job_cold": (None, stage_search_job_cold),
+    "search_job_warm": (setup_search_job_warm, stage_search_job_warm),
+    "search_job_fused": (None, stage_search_job_fused),
+    "document_summary": (None, stage_document_summary),
+    "curated_dashboards": (None, stage_curated_dashboards),
+    "knowledge_base_search": (setup_knowledge_base, stage_knowledge_base_search),
+}
+# Need Chrome and the summarization models; only run with --browser.
+BROWSER_STAGES = {
+    "app_import": (None, stage_app_import),
+    "ntrs_live_pipeline": (None, stage_ntrs_live_pipeline),
+}
+
+
+def run_stage(ctx, setup, func, repeat):
+    """Runs one stage `repeat` times, recording wall time and the tracemalloc peak of each run."""
+    if setup is not None:
+        setup(ctx)
+    seconds, peaks, breakdowns = [], [], []
+    for run in range(repeat):
+        ctx.breakdown = {}
+        tracemalloc.start()
+        start = time.perf_counter()
+        func(ctx, run)
+        seconds.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        breakdowns.append(dict(ctx.breakdown))
+
+    names = sorted({name for breakdown in breakdowns for name in breakdown})
+    return {
+        "runs": repeat,
+        "seconds": {
+            "min": min(seconds),
+            "median": statistics.median(seconds),
+            "mean": statistics.fmean(seconds),
+            "max": max(seconds),
+        },
+        "peak_traced_kib": max(peaks) // 1024,
+        # Sub-stages can overlap (they run concurrently), so they need not add up to the stage time.
+        "breakdown_median_seconds": {name: statistics.median(b.get(name, 0.0) for b in breakdowns) for name in names},
+    }
+
+
+def compare(report, baseline, tolerance, selected=None):
+    """
+    Returns the stages whose median time grew by more than tolerance relative to the baseline.
+    Stages that failed, and baseline stages missing from the report, count as regressions too;
+    with selected, only those stages of the baseline are expected in the report.
+    """
+    regressions = []
+    baseline_stages = baseline.get("stages", {})
+    for name, stage in report["stages"].items():
+        before = baseline_stages.get(name, {}).get("seconds", {}).get("median")
+        after = stage.get("seconds", {}).get("median")
+        if after is None:
+            regressions.append({"stage": name, "baseline_median": before, "error": stage.get("error", "no timings recorded")})
+        elif before and after > before * (1 + tolerance):
+            regressions.append({"stage": name, "baseline_median": before, "median": after, "ratio": after / before})
+    for name in baseline_stages:
+        if name not in report["stages"] and (selected is None or name in selected):
+            regressions.append({"stage": name, "baseline_median": baseline_stages[name].get("seconds", {}).get("median"),
+                                "error": "stage missing from this run"})
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths against local stand-ins.")
+    parser.add_argument("--stages", nargs="*", help="Stages to run (default: all that do not need a browser).")
+    parser.add_argument("--browser", action="store_true", help="Also run the stages that start Chrome and the NLP models.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=parse_latency, default={}, help="Mock latency per service, e.g. nslsl=0.05,gemini=0.5")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fixtures", help="Directory of recorded HTML pages for the mock server to replay.")
+    parser.add_argument("--docs", type=int, default=8, help="PDFs in the synthetic corpus.")
+    parser.add_argument("--pages", type=int, default=40, help="Pages per synthetic PDF.")
+    parser.add_argument("--output", help="Where to write the JSON report (default: stdout only).")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown of a stage's median.")
+    parser.add_argument("--keep-workdir", action="store_true")
+    args = parser.parse_args(argv)
+
+    stages = dict(STAGES, **(BROWSER_STAGES if args.browser else {}))
+    if args.stages:
+        stages = {name: stages[name] for name in args.stages}
+
+    workdir = tempfile.mkdtemp(prefix="summasa-bench-")
+    server = MockServer(latency=args.latency, jitter=args.jitter, fixtures_dir=args.fixtures).start()
+    configure_environment(workdir, server)
+    corpus_dir = os.path.join(workdir, "corpus")
+    write_corpus(corpus_dir, args.docs, args.pages)
+    ctx = BenchmarkContext(workdir, server, corpus_dir)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {"repeat": args.repeat, "latency": server.latency, "jitter": args.jitter, "docs": args.docs, "pages": args.pages},
+        "stages": {},
+    }
+    try:
+        for name, (setup, func) in stages.items():
+            print(f"⏱️ {name} ...", file=sys.stderr)
+            try:
+                report["stages"][name] = run_stage(ctx, setup, func, args.repeat)
+            except Exception as e:
+                if tracemalloc.is_tracing():
+                    tracemalloc.stop()
+                report["stages"][name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"   {json.dumps(report['stages'][name].get('seconds') or report['stages'][name])}", file=sys.stderr)
+    finally:
+        server.stop()
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report["mock_requests"] = server.requests
+    report["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance, selected=args.stages)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
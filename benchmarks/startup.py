@@ -0,0 +1,82 @@
+# benchmarks/startup.py
+"""
+Import-time profile of the app: imports a module in a fresh interpreter with
+`python -X importtime` and reports the total and the slowest top-level packages.
+
+    python -m benchmarks.startup              # profile `import app`
+    python -m benchmarks.startup engine.master_engine --top 15 --json
+
+The import should not start a browser or load torch/transformers; those packages are
+flagged in the report when they show up, so a regression is easy to spot.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Packages that belong on first use (or a warm-up thread), never on the import path.
+DEFERRED_PACKAGES = ("selenium", "webdriver_manager", "torch", "transformers", "keybert", "fitz")
+
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output into {module: (self_us, cumulative_us)}.
+    Nested imports are indented under the module that triggered them; only
+    the outermost entry of a package carries its full cumulative time.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def profile_imports(module="app", env=None):
+    """Imports module in a child interpreter and returns its import-time report."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=dict(os.environ, **(env or {})),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"import {module} failed")
+
+    modules = parse_importtime(completed.stderr)
+    packages = {}
+    for name, (_, cumulative_us) in modules.items():
+        top_level = name.split(".")[0]
+        packages[top_level] = max(packages.get(top_level, 0), cumulative_us)
+    return {
+        "module": module,
+        "total_seconds": modules.get(module, (0, 0))[1] / 1e6,
+        "packages_seconds": {name: us / 1e6 for name, us in sorted(packages.items(), key=lambda item: -item[1])},
+        "deferred_packages_imported": sorted(name for name in DEFERRED_PACKAGES if name in packages),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the import time of the app (or another module).")
+    parser.add_argument("module", nargs="?", default="app")
+    parser.add_argument("--top", type=int, default=10, help="Number of top-level packages to list.")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+    args = parser.parse_args(argv)
+
+    report = profile_imports(args.module)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"import {report['module']}: {report['total_seconds']:.3f}s")
+    for name, seconds in list(report["packages_seconds"].items())[:args.top]:
+        print(f"  {seconds:8.3f}s  {name}")
+    if report["deferred_packages_imported"]:
+        print("⚠️ Imported at start-up but meant to load on first use: " + ", ".join(report["deferred_packages_imported"]))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# engine/chart_data.py
+
+import json
+
+# Bar-chart data travels between the Gemini calls, the job queue, the session store and
+# the dashboard as plain JSON of this shape (no DataFrame, so pandas stays off the hot path):
+#
+#   {"x_name": "Research Area", "y_name": "Normalized Importance",
+#    "labels": ["Propulsion", ...], "values": [1.0, ...]}
+
+
+def chart_series(columns):
+    """
+    Builds a chart series from a {column_name: values} mapping of two columns
+    (label column first, value column second), the same literal a two-column DataFrame takes.
+    """
+    (x_name, labels), (y_name, values) = list(columns.items())[:2]
+    labels, values = list(labels), [float(value) for value in values]
+    if len(labels) != len(values):
+        raise ValueError(f"Chart columns differ in length: {len(labels)} labels, {len(values)} values.")
+    return {"x_name": x_name, "y_name": y_name, "labels": labels, "values": values}
+
+
+def normalized_series(scores, x_name, y_name):
+    """Chart series of a {label: score} mapping with every score divided by the largest one (0..1)."""
+    max_score = max(scores.values(), default=0)
+    values = [score / max_score if max_score else 0 for score in scores.values()]
+    return chart_series({x_name: scores.keys(), y_name: values})
+
+
+def as_chart_series(data):
+    """
+    Returns data as a chart series, or None if it is empty or unrecognised. Also accepts
+    the DataFrame.to_json(orient='split') strings stored by earlier versions.
+    """
+    if not data:
+        return None
+    if isinstance(data, str):
+        try:
+            split = json.loads(data)
+            rows = split["data"]
+            return chart_series({split["columns"][0]: [row[0] for row in rows], split["columns"][1]: [row[1] for row in rows]})
+        except (ValueError, KeyError, IndexError, TypeError):
+            return None
+    if isinstance(data, dict) and {"x_name", "y_name", "labels", "values"} <= data.keys():
+        return data
+    return None
@@ -0,0 +1,118 @@
+# engine/document_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = os.environ.get("DOCUMENT_STORE_PATH", os.path.join("cache", "documents.sqlite3"))
+
+# Per-document ingest stages, in order. A document is only ever moved forward.
+LISTED, DESCRIBED, DOWNLOADED, DONE, FAILED = "listed", "described", "downloaded", "done", "failed"
+
+_COLUMNS = ("url", "title", "abstract", "pdf_path", "summary", "keywords", "stage", "error", "updated_at")
+
+
+class DocumentStore:
+    """
+    SQLite catalogue of ingested documents: metadata, the local PDF path, the NLP summary and
+    keywords, and the ingest stage each document has reached. It doubles as the checkpoint of
+    the bulk ingest (engine/ingest.py) and is read by the dashboard to reuse downloaded PDFs.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS documents (
+                url TEXT PRIMARY KEY,
+                title TEXT,
+                abstract TEXT,
+                pdf_path TEXT,
+                summary TEXT,
+                keywords TEXT,
+                stage TEXT NOT NULL,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS documents_stage ON documents(stage)")
+        # Search terms / ID ranges whose result lists have been fully recorded.
+        self._conn.execute("CREATE TABLE IF NOT EXISTS ingest_sources (source TEXT PRIMARY KEY, documents INTEGER, finished_at REAL)")
+        self._conn.commit()
+
+    def _row_to_dict(self, row):
+        doc = dict(zip(_COLUMNS, row))
+        doc["keywords"] = json.loads(doc["keywords"]) if doc["keywords"] else []
+        return doc
+
+    # --- Documents ---
+    def add(self, url, title=""):
+        """Records a newly discovered document; returns False if it was already known."""
+        with self._lock:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO documents (url, title, stage, updated_at) VALUES (?, ?, ?, ?)",
+                (url, title, LISTED, time.time()),
+            ).rowcount
+            self._conn.commit()
+        return bool(inserted)
+
+    def update(self, url, **fields):
+        """Updates the given columns of a document; empty strings never overwrite stored values."""
+        if "keywords" in fields:
+            fields["keywords"] = json.dumps(fields["keywords"])
+        fields = {k: v for k, v in fields.items() if v != ""}
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE documents SET {assignments} WHERE url = ?", (*fields.values(), url))
+            self._conn.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM documents WHERE url = ?", (url,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def pending(self):
+        """Documents whose ingest was interrupted before reaching DONE (failures excluded)."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM documents WHERE stage NOT IN (?, ?) ORDER BY updated_at", (DONE, FAILED)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def counts(self):
+        """Returns {stage: number of documents}."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT stage, COUNT(*) FROM documents GROUP BY stage").fetchall())
+
+    # --- Sources ---
+    def source_done(self, source):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM ingest_sources WHERE source = ?", (source,)).fetchone() is not None
+
+    def mark_source_done(self, source, documents):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingest_sources (source, documents, finished_at) VALUES (?, ?, ?)",
+                (source, documents, time.time()),
+            )
+            self._conn.commit()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """Returns the process-wide document store, creating it on first use."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = DocumentStore()
+    return _default_store
@@ -0,0 +1,172 @@
+# engine/downloads.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+from engine.http_client import get_default_client as get_http_client
+
+DEFAULT_DOWNLOAD_DIR = os.environ.get("DOWNLOAD_CACHE_DIR", os.path.join("cache", "downloads"))
+DEFAULT_MAX_CONCURRENT = int(os.environ.get("DOWNLOAD_CONCURRENCY", 4))
+CHUNK_SIZE = 256 * 1024
+# Attempts per download; every retry resumes from the bytes already on disk.
+DEFAULT_ATTEMPTS = 3
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-\d+/(?:\d+|\*)")
+
+
+def _read_meta(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(path, meta):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, path)
+
+
+class DownloadManager:
+    """
+    Streams files to disk with resume and revalidation.
+
+    - Responses are written in CHUNK_SIZE pieces to "<dest>.part" and renamed on completion,
+      so a file at dest is always complete.
+    - An interrupted download resumes with an HTTP Range request (guarded by If-Range), both
+      on retry and on the next call.
+    - Finished files remember their ETag / Last-Modified in "<dest>.meta.json"; asking for
+      them again sends a conditional request and a 304 reuses the file on disk.
+    - At most max_concurrent transfers run at once, and concurrent requests for the same URL
+      and destination share a single transfer.
+    """
+
+    def __init__(self, download_dir=DEFAULT_DOWNLOAD_DIR, max_concurrent=DEFAULT_MAX_CONCURRENT,
+                 http_client=None, attempts=DEFAULT_ATTEMPTS):
+        self.download_dir = download_dir
+        self.attempts = attempts
+        self._http = http_client or get_http_client()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._in_flight = {}  # absolute dest path -> (url, Future)
+        self._lock = threading.Lock()
+
+    def cache_path(self, url, suffix=""):
+        """Content-independent default destination for a URL inside download_dir."""
+        if not suffix:
+            suffix = os.path.splitext(urlsplit(url).path)[1]
+        return os.path.join(self.download_dir, hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + suffix)
+
+    def download(self, url, dest_path=None, label="download", timeout=60):
+        """
+        Makes sure dest_path (default: cache_path(url)) holds the current content of url and
+        returns the path. Raises on failure, and raises ValueError if another URL is being
+        downloaded to the same destination at the moment.
+        """
+        dest_path = os.path.abspath(dest_path or self.cache_path(url))
+        with self._lock:
+            in_flight_url, future = self._in_flight.get(dest_path, (url, None))
+            if in_flight_url != url:
+                raise ValueError(f"{dest_path} is already being downloaded from {in_flight_url}, not {url}.")
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[dest_path] = (url, future)
+        if not owner:
+            return future.result()
+
+        try:
+            with self._slots:
+                self._fetch(url, dest_path, label, timeout)
+            future.set_result(dest_path)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.pop(dest_path, None)
+        return future.result()
+
+    def _fetch(self, url, dest_path, label, timeout):
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        part_path, meta_path = f"{dest_path}.part", f"{dest_path}.meta.json"
+
+        for attempt in range(1, self.attempts + 1):
+            meta = _read_meta(meta_path)
+            validator = meta.get("etag") or meta.get("last_modified")
+            if meta.get("url") != url:
+                meta, validator = {}, None
+            headers = {}
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+            if offset and validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+            elif os.path.exists(dest_path) and meta.get("complete"):
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+                offset = 0
+            else:
+                offset = 0
+
+            try:
+                with self._http.get(url, label=label, headers=headers, stream=True, timeout=timeout) as response:
+                    if response.status_code == 304:
+                        return
+                    if response.status_code == 416:
+                        # The partial file is not a prefix of the current content; start over.
+                        os.remove(part_path)
+                        continue
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        offset = 0  # the server ignored the range or the file changed: start over
+                    else:
+                        content_range = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+                        if content_range is None or int(content_range.group(1)) != offset:
+                            # Appending a range that does not start where the file ends would corrupt it.
+                            print(f"⚠️ {url} answered with range '{response.headers.get('Content-Range')}' "
+                                  f"instead of bytes {offset}-; downloading it again from the start.")
+                            os.remove(part_path)
+                            continue
+                    meta = {
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "complete": False,
+                    }
+                    _write_meta(meta_path, meta)
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+            except Exception as e:
+                if attempt == self.attempts or getattr(getattr(e, "response", None), "status_code", 0):
+                    raise
+                print(f"⚠️ Download of {url} interrupted ({e}); resuming (attempt {attempt + 1}/{self.attempts}).")
+                continue
+
+            os.replace(part_path, dest_path)
+            meta["complete"] = True
+            _write_meta(meta_path, meta)
+            return
+
+        raise RuntimeError(f"Could not download {url} after {self.attempts} attempts.")
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_default_manager():
+    """Returns the process-wide download manager, creating it on first use."""
+    global _default_manager
+    if _default_manager is None:
+        with _default_manager_lock:
+            if _default_manager is None:
+                _default_manager = DownloadManager()
+    return _default_manager
@@ -0,0 +1,182 @@
+# engine/driver_pool.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_MAX_SIZE = int(os.environ.get("WEBDRIVER_POOL_SIZE", 3))
+DEFAULT_MAX_PAGES_PER_DRIVER = int(os.environ.get("WEBDRIVER_MAX_PAGES", 50))
+DEFAULT_CHECKOUT_TIMEOUT = 120
+
+
+def create_headless_chrome():
+    """Default factory: a headless Chrome instance. Selenium is imported on first use."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=chrome_options)
+
+
+class WebDriverPool:
+    """
+    Bounded pool of Selenium WebDriver instances shared between callbacks.
+
+    Drivers are created lazily up to max_size. A checked-out driver is used by one caller
+    at a time; idle drivers are health-checked before being handed out, and each driver is
+    recycled after max_pages leases (every lease is expected to load roughly one page).
+    """
+
+    def __init__(self, factory=create_headless_chrome, max_size=DEFAULT_MAX_SIZE,
+                 max_pages=DEFAULT_MAX_PAGES_PER_DRIVER, checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self._idle = []  # drivers ready to be handed out
+        self._uses = {}  # id(driver) -> number of leases served
+        self._size = 0  # drivers alive, idle or checked out
+        self._closed = False
+        self._cond = threading.Condition()
+        self.created = 0
+        self.recycled = 0
+
+    def _is_healthy(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _destroy(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠️ Error while quitting WebDriver: {e}")
+
+    def checkout(self, timeout=None):
+        """Returns an idle driver, creating one if the pool is below max_size, else waits for one."""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.checkout_timeout)
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("WebDriver pool is closed.")
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    driver = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a free WebDriver.")
+                self._cond.wait(remaining)
+
+        # Creating or probing a browser is slow, so it happens outside the lock.
+        if driver is not None and not self._is_healthy(driver):
+            print("⚠️ Discarding unhealthy WebDriver.")
+            self._destroy(driver)
+            driver = None
+        if driver is None:
+            try:
+                print("🚀 Starting a new WebDriver for the pool...")
+                driver = self.factory()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self.created += 1
+
+        with self._cond:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def checkin(self, driver, discard=False):
+        """Returns a driver to the pool; broken or worn-out drivers are quit instead."""
+        with self._cond:
+            worn_out = self._uses.get(id(driver), 0) >= self.max_pages
+            keep = not (discard or worn_out or self._closed)
+            if keep:
+                self._idle.append(driver)
+            else:
+                self._size -= 1
+                if worn_out:
+                    self.recycled += 1
+            self._cond.notify()
+        if not keep:
+            self._destroy(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Leases a driver for the duration of a with-block."""
+        driver = self.checkout(timeout)
+        failed = False
+        try:
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # A driver that raised may be in an unknown state, so only keep it if it still responds.
+            self.checkin(driver, discard=failed and not self._is_healthy(driver))
+
+    def warm_up(self, count=1, background=False):
+        """
+        Starts up to count browsers ahead of the first request and parks them in the pool.
+        With background=True this happens on a daemon thread and the thread is returned.
+        """
+        def _start_all():
+            drivers = []
+            try:
+                for _ in range(min(count, self.max_size)):
+                    drivers.append(self.checkout())
+            except Exception as e:
+                print(f"❌ Failed to warm up WebDriver pool: {e}")
+            for driver in drivers:
+                self.checkin(driver)
+
+        if background:
+            thread = threading.Thread(target=_start_all, name="webdriver-warm-up", daemon=True)
+            thread.start()
+            return thread
+        _start_all()
+        return None
+
+    def close(self):
+        """Quits every idle driver; drivers still checked out are quit when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for driver in idle:
+            self._destroy(driver)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                "created": self.created,
+                "recycled": self.recycled,
+            }
+
+
+@contextmanager
+def lease_driver(driver_or_pool):
+    """Yields a driver from a pool, or the given driver itself when it is not a pool."""
+    if isinstance(driver_or_pool, WebDriverPool):
+        with driver_or_pool.driver() as driver:
+            yield driver
+    else:
+        yield driver_or_pool
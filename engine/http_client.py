@@ -0,0 +1,113 @@
+# engine/http_client.py
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 10))
+DEFAULT_RETRIES = int(os.environ.get("HTTP_RETRIES", 3))
+DEFAULT_BACKOFF_FACTOR = float(os.environ.get("HTTP_BACKOFF_FACTOR", 0.5))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket catches the rest.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket histogram of request latencies."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self.counts[i] += 1
+                    break
+            self.total += 1
+            self.sum_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.total,
+                "mean_seconds": self.sum_seconds / self.total if self.total else 0.0,
+                "max_seconds": self.max_seconds,
+                "buckets": {("+inf" if bound == float("inf") else f"<={bound}s"): count for bound, count in zip(self.buckets, self.counts)},
+            }
+
+
+class HttpClient:
+    """
+    Shared requests session with a keep-alive connection pool, automatic retries with
+    exponential backoff on 429/5xx responses, and per-label latency histograms.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, retries=DEFAULT_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR):
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,  # hand the final response back so callers can inspect the error body
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, label):
+        with self._lock:
+            if label not in self._histograms:
+                self._histograms[label] = LatencyHistogram()
+            return self._histograms[label]
+
+    def request(self, method, url, label="default", **kwargs):
+        """Sends a request through the pooled session and records its latency under label."""
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            self._histogram(label).record(time.perf_counter() - start)
+
+    def get(self, url, label="default", **kwargs):
+        return self.request("GET", url, label=label, **kwargs)
+
+    def post(self, url, label="default", **kwargs):
+        return self.request("POST", url, label=label, **kwargs)
+
+    def latency_stats(self):
+        """Returns a histogram snapshot for every label seen so far."""
+        with self._lock:
+            labels = list(self._histograms.items())
+        return {label: histogram.snapshot() for label, histogram in labels}
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Returns the process-wide pooled HTTP client, creating it on first use."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
@@ -0,0 +1,268 @@
+# engine/ingest.py
+"""
+Bulk ingest of NSLSL documents into the local knowledge base.
+
+    python -m engine.ingest --terms "lunar regolith" "ion propulsion" --limit 50
+    python -m engine.ingest --terms-file terms.txt --id-range 20800-20900
+
+Each document goes through four stages connected by bounded queues, so a slow stage
+(usually the NLP models) holds back the ones before it instead of piling up work:
+
+    list (search / ID range) -> abstract -> PDF download -> summary + keywords
+
+The NLP stage takes the documents waiting in its queue in batches (up to NLP_BATCH_SIZE)
+and runs them through the batched summarizer and keyword extractor together.
+
+Progress is checkpointed per document in the document store, so an interrupted run
+picks up where it stopped when started again with the same arguments. Results end up
+where the dashboard and the knowledge-base search read them: the document store, the
+BM25 search index, the vector index (if SEMANTIC_INDEXING=1) and the download cache.
+"""
+
+import argparse
+import hashlib
+import os
+import queue
+import threading
+import time
+
+from engine.document_store import get_default_store, LISTED, DESCRIBED, DOWNLOADED, DONE, FAILED
+from engine.downloads import DEFAULT_DOWNLOAD_DIR, DEFAULT_MAX_CONCURRENT
+from engine.driver_pool import WebDriverPool
+
+INGEST_PDF_DIR = os.path.join(DEFAULT_DOWNLOAD_DIR, "ingest")
+DEFAULT_LIMIT = 25
+DEFAULT_QUEUE_SIZE = 16
+ABSTRACT_WORKERS = 4
+# The summarizer and keyword models are CPU/GPU bound and share one instance, so one worker.
+NLP_WORKERS = 1
+NLP_BATCH_SIZE = int(os.environ.get("INGEST_NLP_BATCH_SIZE", 8))
+# The stages only update the search indexes in memory; they are written to disk after this
+# many indexed documents and once more when the run ends, instead of after every document.
+INDEX_SAVE_EVERY = int(os.environ.get("INGEST_INDEX_SAVE_EVERY", 25))
+
+
+def _pdf_folder(url):
+    """Every document gets its own folder, since PDF text is extracted a whole folder at a time."""
+    return os.path.join(INGEST_PDF_DIR, hashlib.sha256(url.encode("utf-8")).hexdigest()[:16])
+
+
+def _save_indexes():
+    """Writes the BM25 and (if enabled) vector index changes made by the stages to disk."""
+    from engine.search_index import get_default_index
+    from engine.vector_index import SEMANTIC_INDEXING, get_default_vector_index
+    try:
+        get_default_index().save()
+        if SEMANTIC_INDEXING:
+            get_default_vector_index().save()
+    except Exception as e:
+        print(f"⚠️ Could not save the search indexes: {e}")
+
+
+def _parse_id_range(value):
+    start, _, end = value.partition("-")
+    return range(int(start), int(end or start) + 1)
+
+
+class _Stage:
+    """
+    A pool of worker threads reading from inbox and feeding outbox (None ends the stream).
+    A document whose handler raises is marked FAILED, or with retry_failed only gets the
+    error recorded and stays at its stage, so the next run tries it again.
+    With batch_size > 1, handle receives a list of the documents already waiting (never
+    waiting for a batch to fill up) and returns one result per document.
+    """
+
+    def __init__(self, name, handle, inbox, outbox, workers, store, retry_failed=False, batch_size=1):
+        self.name, self.handle, self.inbox, self.outbox, self.store = name, handle, inbox, outbox, store
+        self.retry_failed, self.batch_size = retry_failed, batch_size
+        self.processed = 0
+        self._threads = [threading.Thread(target=self._work, name=f"ingest-{name}-{i}", daemon=True) for i in range(workers)]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def _next_batch(self):
+        """Blocks for one document, then adds those already queued; returns (batch, stream_ended)."""
+        batch = []
+        doc = self.inbox.get()
+        while doc is not None:
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                break
+            try:
+                doc = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+        return batch, doc is None
+
+    def _run(self, batch):
+        try:
+            results = self.handle(batch) if self.batch_size > 1 else [self.handle(batch[0])]
+        except Exception as e:
+            if len(batch) > 1:
+                # One bad document should not fail the others: try them one at a time.
+                for doc in batch:
+                    self._run([doc])
+                return
+            print(f"❌ [{self.name}] {batch[0]['url']}: {e}")
+            if self.retry_failed:
+                self.store.update(batch[0]["url"], error=f"{self.name}: {e}")
+            else:
+                self.store.update(batch[0]["url"], stage=FAILED, error=f"{self.name}: {e}")
+            return
+        self.processed += len(batch)
+        for result in results:
+            if result is not None and self.outbox is not None:
+                self.outbox.put(result)  # blocks while the next stage is behind
+
+    def _work(self):
+        ended = False
+        while not ended:
+            batch, ended = self._next_batch()
+            if batch:
+                self._run(batch)
+
+    def finish(self, next_stage=None):
+        """Waits for the workers to drain the inbox, then ends the next stage's stream."""
+        for thread in self._threads:
+            thread.join()
+        if next_stage is not None:
+            for _ in next_stage._threads:
+                next_stage.inbox.put(None)
+
+
+def run_ingest(terms=(), id_ranges=(), limit=DEFAULT_LIMIT, download_workers=DEFAULT_MAX_CONCURRENT,
+               queue_size=DEFAULT_QUEUE_SIZE, store=None, driver=None):
+    """Runs the ingest pipeline and returns the per-stage document counts of the store."""
+    # Imported here so `--help` works without the scraping and NLP dependencies loaded.
+    from nslsl_scraper import NSLSL_SEARCH_URL, scrape_nslsl_search_results, get_abstracts_from_results, download_nslsl_pdf
+    from engine.processing import extract_text_from_pdfs, summarize_many, extract_keywords_many
+    from engine.vector_index import SEMANTIC_INDEXING
+
+    store = store or get_default_store()
+    owns_driver = driver is None
+    driver = driver or WebDriverPool()
+
+    unsaved = [0]
+    unsaved_lock = threading.Lock()
+
+    def indexed():
+        with unsaved_lock:
+            unsaved[0] += 1
+            if unsaved[0] < INDEX_SAVE_EVERY:
+                return
+            unsaved[0] = 0
+        _save_indexes()
+
+    def describe(doc):
+        get_abstracts_from_results(driver, [doc], max_workers=1, save_index=False)
+        indexed()
+        store.update(doc["url"], abstract=doc.get("abstract", ""), stage=DESCRIBED)
+        return doc
+
+    def download(doc):
+        # Errors propagate so the stage keeps the document for the next run; None means no attachment.
+        pdf_path = download_nslsl_pdf(driver, doc["url"], save_dir=_pdf_folder(doc["url"]), save_index=False, raise_errors=True)
+        indexed()
+        if pdf_path is None:
+            # Documents without an attachment stay searchable by title and abstract.
+            store.update(doc["url"], stage=DONE, error="The document page has no PDF attachment.")
+            return None
+        store.update(doc["url"], pdf_path=pdf_path, stage=DOWNLOADED)
+        return doc
+
+    def analyse(docs):
+        texts = [extract_text_from_pdfs(_pdf_folder(doc["url"])) for doc in docs]
+        summaries = summarize_many(texts)
+        # The document embeddings are kept in the vector index, saved with the other indexes.
+        doc_ids = [doc["url"] for doc in docs] if SEMANTIC_INDEXING else None
+        keywords = extract_keywords_many(texts, doc_ids=doc_ids)
+        for doc, summary, doc_keywords in zip(docs, summaries, keywords):
+            store.update(doc["url"], summary=summary, keywords=doc_keywords, stage=DONE, error=None)
+            print(f"✅ Ingested: {doc.get('title') or doc['url']}")
+        return [None] * len(docs)
+
+    describe_q, download_q, analyse_q = (queue.Queue(maxsize=queue_size) for _ in range(3))
+    stages = [
+        _Stage("abstract", describe, describe_q, download_q, ABSTRACT_WORKERS, store),
+        # Download errors are usually network or browser trouble, so those documents are retried.
+        _Stage("download", download, download_q, analyse_q, download_workers, store, retry_failed=True),
+        _Stage("nlp", analyse, analyse_q, None, NLP_WORKERS, store, batch_size=NLP_BATCH_SIZE),
+    ]
+    resume_queue = {LISTED: describe_q, DESCRIBED: download_q, DOWNLOADED: analyse_q}
+
+    started = time.perf_counter()
+    for stage in stages:
+        stage.start()
+    try:
+        # 1. Documents left half-way by an interrupted run continue at the stage they reached.
+        pending = store.pending()
+        if pending:
+            print(f"↩️ Resuming {len(pending)} documents from the last run.")
+        for doc in pending:
+            resume_queue[doc["stage"]].put(doc)
+
+        # 2. New sources: search terms and NSLSL ID ranges that have not been listed yet.
+        sources = [(f"term:{term}", term) for term in terms]
+        sources += [(f"id:{doc_id}", doc_id) for id_range in id_ranges for doc_id in id_range]
+        for source, value in sources:
+            if store.source_done(source):
+                continue
+            if source.startswith("term:"):
+                try:
+                    documents = scrape_nslsl_search_results(driver, value, limit=limit, raise_errors=True)
+                except Exception as e:
+                    # The source stays pending, so the next run searches for it again.
+                    print(f"⚠️ Search for '{value}' failed ({e}); it will be retried on the next run.")
+                    continue
+            else:
+                documents = [{"title": "", "url": f"{NSLSL_SEARCH_URL}/DetailsForID/{value}"}]
+            for doc in documents:
+                if store.add(doc["url"], doc.get("title", "")):
+                    describe_q.put(doc)
+            store.mark_source_done(source, len(documents))
+
+        for _ in stages[0]._threads:
+            describe_q.put(None)
+        for stage, next_stage in zip(stages, stages[1:] + [None]):
+            stage.finish(next_stage)
+    except KeyboardInterrupt:
+        print("🛑 Ingest interrupted; progress is saved and the next run resumes from here.")
+    finally:
+        _save_indexes()
+        if owns_driver:
+            driver.close()
+
+    counts = store.counts()
+    print(f"⏱️ Ingest finished in {time.perf_counter() - started:.1f}s: "
+          + ", ".join(f"{stage.name} {stage.processed}" for stage in stages)
+          + f" | store: {counts}")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-populate the local NSLSL knowledge base.")
+    parser.add_argument("--terms", nargs="*", default=[], help="Search terms to ingest.")
+    parser.add_argument("--terms-file", help="File with one search term per line.")
+    parser.add_argument("--id-range", action="append", default=[], type=_parse_id_range,
+                        help="NSLSL document IDs, e.g. 20800-20900 (repeatable).")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Maximum results per search term.")
+    parser.add_argument("--download-workers", type=int, default=DEFAULT_MAX_CONCURRENT)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Maximum documents waiting between two stages.")
+    args = parser.parse_args(argv)
+
+    terms = list(args.terms)
+    if args.terms_file:
+        with open(args.terms_file, "r", encoding="utf-8") as f:
+            terms += [line.strip() for line in f if line.strip()]
+    if not terms and not args.id_range:
+        parser.error("give --terms, --terms-file or --id-range")
+
+    run_ingest(terms, args.id_range, limit=args.limit, download_workers=args.download_workers, queue_size=args.queue_size)
+
+
+if __name__ == "__main__":
+    main()
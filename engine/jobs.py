@@ -0,0 +1,219 @@
+# engine/jobs.py
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+DEFAULT_DB_PATH = os.environ.get("JOB_QUEUE_PATH", os.path.join("cache", "jobs.sqlite3"))
+DEFAULT_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+# Finished jobs are kept this long so slow pollers can still pick up their results.
+DEFAULT_RETENTION_SECONDS = 24 * 3600
+POLL_SECONDS = 1.0
+# Running jobs are heartbeated by the process that claimed them; a job whose heartbeat is
+# older than JOB_STALE_SECONDS belongs to a dead worker and is queued again.
+HEARTBEAT_SECONDS = 10.0
+DEFAULT_STALE_SECONDS = float(os.environ.get("JOB_STALE_SECONDS", 60))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueue:
+    """
+    Persistent job queue with a local pool of worker threads.
+
+    Jobs are rows in a SQLite table, so their status, progress and results are visible to
+    every process that opens the same database. Each claimed job records the queue instance
+    that owns it and a heartbeat; running jobs whose owner stopped heartbeating (a crashed or
+    restarted process) are queued again, while jobs of live processes are left alone.
+    Handlers are registered per job kind and receive (payload, report), where report(progress, stage, partial=None)
+    publishes progress (0..1), a human-readable stage and an optional partial result.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, workers=DEFAULT_WORKERS, retention_seconds=DEFAULT_RETENTION_SECONDS,
+                 stale_seconds=DEFAULT_STALE_SECONDS):
+        self.db_path = db_path
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self.stale_seconds = stale_seconds
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers = {}
+        self._threads = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._local = threading.local()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    stage TEXT,
+                    partial TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    heartbeat_at REAL
+                )"""
+            )
+            # Databases created before jobs had owners get the columns added in place.
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs(status, created_at)")
+
+    def _connect(self):
+        """Returns this thread's connection (SQLite connections are not shared across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # --- Producer API ---
+    def register(self, kind, handler):
+        """Registers the function that runs jobs of the given kind."""
+        self._handlers[kind] = handler
+
+    def submit(self, kind, payload):
+        """Queues a job and returns its ID."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, kind, payload, status, stage, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), QUEUED, "Queued", now, now),
+        )
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        """Returns the job's status dict, or None if it does not exist."""
+        row = self._connect().execute(
+            "SELECT id, kind, status, progress, stage, partial, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "progress": row[3],
+            "stage": row[4],
+            "partial": json.loads(row[5]) if row[5] else None,
+            "result": json.loads(row[6]) if row[6] else None,
+            "error": row[7],
+            "created_at": row[8],
+            "updated_at": row[9],
+        }
+
+    def queue_depth(self):
+        return self._connect().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    # --- Workers ---
+    def start(self):
+        """Starts the worker and heartbeat threads (idempotent) after re-queuing jobs of dead workers."""
+        if self._threads:
+            return
+        now = time.time()
+        self.requeue_stale()
+        self._connect().execute("DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, now - self.retention_seconds))
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def requeue_stale(self):
+        """Queues again every running job whose owner has not heartbeated within stale_seconds; returns how many."""
+        now = time.time()
+        requeued = self._connect().execute(
+            "UPDATE jobs SET status = ?, stage = ?, owner = NULL, updated_at = ? "
+            "WHERE status = ? AND COALESCE(heartbeat_at, updated_at) < ?",
+            (QUEUED, "Re-queued after its worker stopped", now, RUNNING, now - self.stale_seconds),
+        ).rowcount
+        if requeued:
+            print(f"♻️ Re-queued {requeued} job(s) abandoned by a stopped worker.")
+            self._wake.set()
+        return requeued
+
+    def _heartbeat(self):
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            try:
+                self._connect().execute(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?", (time.time(), self.owner_id, RUNNING)
+                )
+                self.requeue_stale()
+            except sqlite3.Error as e:
+                print(f"⚠️ Job heartbeat failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _claim(self):
+        """Atomically moves the oldest queued job to running and returns (id, kind, payload)."""
+        conn = self._connect()
+        while True:
+            row = conn.execute(
+                "SELECT id, kind, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            claimed = conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, owner = ?, heartbeat_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, "Starting", self.owner_id, now, now, row[0], QUEUED),
+            ).rowcount
+            if claimed:
+                return row[0], row[1], json.loads(row[2])
+            # Another worker (or process) got there first; try the next job.
+
+    def _update(self, job_id, **fields):
+        """Updates a job this instance owns; does nothing if the job was re-queued and claimed elsewhere meanwhile."""
+        fields["updated_at"] = fields["heartbeat_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._connect().execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ? AND owner = ?", (*fields.values(), job_id, self.owner_id)
+        )
+
+    def _work(self):
+        while not self._stop.is_set():
+            job = self._claim()
+            if job is None:
+                self._wake.wait(POLL_SECONDS)
+                self._wake.clear()
+                continue
+
+            job_id, kind, payload = job
+            handler = self._handlers.get(kind)
+            if handler is None:
+                self._update(job_id, status=FAILED, error=f"No handler registered for job kind '{kind}'.")
+                continue
+
+            def report(progress, stage, partial=None):
+                fields = {"progress": float(progress), "stage": stage}
+                if partial is not None:
+                    fields["partial"] = json.dumps(partial)
+                self._update(job_id, **fields)
+
+            try:
+                result = handler(payload, report)
+                self._update(job_id, status=DONE, progress=1.0, stage="Done", result=json.dumps(result))
+            except Exception as e:
+                traceback.print_exc()
+                self._update(job_id, status=FAILED, stage="Failed", error=str(e))
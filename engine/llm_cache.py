@@ -0,0 +1,138 @@
+# engine/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_DB_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join("cache", "llm_responses.sqlite3"))
+DEFAULT_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+DEFAULT_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def _fingerprint_value(value):
+    """
+    Replaces inline binary payloads with their SHA-256 so large PDFs hash cheaply and stably.
+    Uploaded files should be described by {"mime_type", "sha256"} of their content: their
+    file_uri changes with every upload, so a key containing it would miss after a restart.
+    """
+    if isinstance(value, dict):
+        if "data" in value and "mime_type" in value:
+            return {"mime_type": value["mime_type"], "sha256": hashlib.sha256(value["data"].encode()).hexdigest()}
+        if "sha256" in value and "mime_type" in value:
+            return {"mime_type": value["mime_type"], "sha256": value["sha256"]}
+        return {k: _fingerprint_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fingerprint_value(v) for v in value]
+    return value
+
+
+def request_fingerprint(model_name, payload):
+    """Returns a stable cache key for a generateContent request: model + prompt + content hashes."""
+    canonical = json.dumps(
+        {"model": model_name, "payload": _fingerprint_value(payload)},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LlmResponseCache:
+    """
+    SQLite-backed cache of LLM responses keyed by request fingerprint.
+
+    Entries expire after ttl_seconds. When the stored responses exceed max_bytes the
+    least recently read entries are evicted first.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Returns the cached response for a fingerprint, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[0] < now - self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self, key, model_name, response):
+        """Stores a response and evicts expired and least recently used entries past the size budget."""
+        body = zlib.compress(json.dumps(response, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, created_at, last_access, size, body) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, now, now, len(body), body),
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, size in self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access ASC"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    total -= size
+            self._conn.commit()
+
+    def stats(self):
+        """Returns hit/miss counters plus the number and size of stored entries."""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Returns the process-wide LLM response cache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = LlmResponseCache()
+    return _default_cache
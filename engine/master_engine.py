@@ -1,15 +1,58 @@
-import pandas as pd
-import numpy as np
+import os
+import random
 
 # Import your other engine components
-from engine.scraper import scrape_nslsl
+# (the Selenium scraper and the vector index are imported where they are used,
+# so answering from the BM25 knowledge base never loads them)
 from engine.processing import summarize_text, extract_keywords
+from engine.models import warm_up
+from engine.search_index import get_default_index
 
-def run_master_pipeline(search_text: str, live_scrape: bool = False):
+KNOWLEDGE_BASE_TOP_K = 10
+
+# Optionally load the NLP models at startup instead of on the first live scrape.
+if os.environ.get("ENGINE_WARM_UP") == "1":
+    warm_up(background=True)
+
+def _knowledge_base_result(search_text, hits, source):
+    """Formats ranked knowledge-base hits ({'title', 'url', 'abstract', 'score'}) for the frontend."""
+    if not hits:
+        return {
+            'title': f"Knowledge Base Analysis for: '{search_text}'",
+            'summary': f"No documents about '{search_text}' are in the local knowledge base yet.",
+            'experiments': [],
+            'graph_elements': []
+        }
+
+    summary = f"Found {len(hits)} documents about '{search_text}' in the local knowledge base ({source}):\n\n" + "\n".join(
+        f"- [{hit['title'] or hit['url']}]({hit['url']}): {hit['abstract'][:300] or 'No abstract indexed.'}" for hit in hits
+    )
+    query_node = {'data': {'id': 'query', 'label': search_text}}
+    doc_nodes = [{'data': {'id': hit['url'], 'label': hit['title'] or hit['url']}} for hit in hits]
+    edges = [{'data': {'source': 'query', 'target': hit['url']}} for hit in hits]
+
+    return {
+        'title': f"Knowledge Base Analysis for: '{search_text}'",
+        'summary': summary,
+        'experiments': [{'Source': hit['title'] or hit['url'], 'Score': round(hit['score'], 3)} for hit in hits],
+        'graph_elements': [query_node] + doc_nodes + edges
+    }
+
+def _semantic_hits(search_text, top_k):
+    """Runs a vector search and keeps the best-scoring chunk per document."""
+    from engine.vector_index import get_default_vector_index
+    hits = {}
+    for score, meta in get_default_vector_index().search(search_text, top_k=top_k * 4):
+        if meta['url'] not in hits:
+            hits[meta['url']] = {'title': meta.get('title', ''), 'url': meta['url'], 'abstract': meta.get('text', ''), 'score': score}
+    return list(hits.values())[:top_k]
+
+def run_master_pipeline(search_text: str, live_scrape: bool = False, semantic: bool = False):
     """
     Orchestrates the backend logic.
     - If live_scrape is True, it runs the scraper and then the NLP models.
-    - Otherwise, it would use an internal database (simulated here).
+    - Otherwise, it answers from the local search index of previously scraped documents,
+      ranked by BM25 keyword matching, or by embedding similarity when semantic is True.
     """
     print(f"Engine: Master pipeline triggered. Live Scrape: {live_scrape}")
 
@@ -18,6 +61,8 @@ def run_master_pipeline(search_text: str, live_scrape: bool = False):
         if not search_text:
             raise ValueError("A search keyword is required for live scraping.")
         
+        from engine.scraper import scrape_nslsl
+
         # 1. Run the slow scraping task
         source_text = scrape_nslsl(search_text)
         if "failed" in source_text or "No results" in source_text:
@@ -31,17 +76,13 @@ def run_master_pipeline(search_text: str, live_scrape: bool = False):
         return {
             'title': f"Live Web Analysis for: '{search_text}'",
             'summary': summary,
-            'experiments': pd.DataFrame({'Keywords': keywords, 'Relevance': np.random.rand(len(keywords))}).to_dict('records'),
+            'experiments': [{'Keywords': kw, 'Relevance': random.random()} for kw in keywords],
             'graph_elements': [{'data': {'id': kw, 'label': kw}} for kw in keywords]
         }
     else:
-        # --- INTERNAL KNOWLEDGE BASE WORKFLOW (SIMULATED) ---
-        summary = f"This is a summary from our internal knowledge base about '{search_text}'."
-        keywords = ["Internal", "Database", "Result"]
-        
-        return {
-            'title': f"Knowledge Base Analysis for: '{search_text}'",
-            'summary': summary,
-            'experiments': pd.DataFrame({'Source': keywords, 'Count': [10, 8, 5]}).to_dict('records'),
-            'graph_elements': [{'data': {'id': kw, 'label': kw}} for kw in keywords]
-        }
+        # --- INTERNAL KNOWLEDGE BASE WORKFLOW ---
+        # Ranked lookup in the local indexes built up by the scraper; no network access.
+        if semantic:
+            return _knowledge_base_result(search_text, _semantic_hits(search_text, KNOWLEDGE_BASE_TOP_K), "semantic search")
+        hits = get_default_index().search(search_text, top_k=KNOWLEDGE_BASE_TOP_K)
+        return _knowledge_base_result(search_text, hits, "keyword search")
@@ -0,0 +1,155 @@
+# engine/models.py
+
+import gc
+import threading
+import time
+from contextlib import contextmanager
+
+SUMMARIZER_MODEL = "facebook/bart-large-cnn"
+
+# --- Loaders ---
+# Heavy libraries are imported inside the loaders so importing this module stays cheap.
+def _load_summarizer():
+    from transformers import pipeline
+    return pipeline("summarization", model=SUMMARIZER_MODEL)
+
+def _load_keyword_model():
+    from keybert import KeyBERT
+    return KeyBERT()
+
+_LOADERS = {
+    "summarizer": _load_summarizer,
+    "keywords": _load_keyword_model,
+}
+
+# --- Registry State ---
+_models = {}
+_registry_lock = threading.Lock()
+_load_locks = {name: threading.Lock() for name in _LOADERS}
+_metrics = {
+    name: {"loads": 0, "load_seconds": 0.0, "calls": 0, "inference_seconds": 0.0, "last_used": None}
+    for name in _LOADERS
+}
+
+
+def register_model(name, loader):
+    """Registers (or replaces) the loader used to build a named model."""
+    with _registry_lock:
+        _LOADERS[name] = loader
+        _load_locks.setdefault(name, threading.Lock())
+        _metrics.setdefault(name, {"loads": 0, "load_seconds": 0.0, "calls": 0, "inference_seconds": 0.0, "last_used": None})
+        _models.pop(name, None)
+
+
+def get_model(name):
+    """
+    Returns the shared instance of a named model, loading it on first use.
+    Concurrent callers asking for the same model wait for a single load.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _LOADERS:
+        raise KeyError(f"Unknown model: '{name}'")
+
+    with _load_locks[name]:
+        model = _models.get(name)
+        if model is None:
+            print(f"Engine: Loading model '{name}'...")
+            start = time.perf_counter()
+            model = _LOADERS[name]()
+            elapsed = time.perf_counter() - start
+            with _registry_lock:
+                _models[name] = model
+                _metrics[name]["loads"] += 1
+                _metrics[name]["load_seconds"] += elapsed
+                _metrics[name]["last_used"] = time.time()
+            print(f"Engine: Model '{name}' loaded in {elapsed:.2f}s")
+    return model
+
+
+def get_summarizer():
+    """Returns the shared BART summarization pipeline."""
+    return get_model("summarizer")
+
+
+def get_keyword_model():
+    """Returns the shared KeyBERT model."""
+    return get_model("keywords")
+
+
+@contextmanager
+def track_inference(name):
+    """Records call count and wall time for an inference call on a named model."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _registry_lock:
+            stats = _metrics[name]
+            stats["calls"] += 1
+            stats["inference_seconds"] += elapsed
+            stats["last_used"] = time.time()
+
+
+def warm_up(names=None, background=False):
+    """
+    Loads the given models (all registered models by default) ahead of the first request.
+    With background=True the loading happens on a daemon thread and the thread is returned.
+    """
+    names = list(names or _LOADERS)
+
+    def _load_all():
+        for name in names:
+            try:
+                get_model(name)
+            except Exception as e:
+                print(f"❌ Engine: Failed to warm up model '{name}': {e}")
+
+    if background:
+        thread = threading.Thread(target=_load_all, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+    _load_all()
+    return None
+
+
+def unload_model(name=None):
+    """Drops a loaded model (or every model when name is None) so its memory can be reclaimed."""
+    with _registry_lock:
+        names = [name] if name else list(_models)
+        unloaded = [n for n in names if _models.pop(n, None) is not None]
+    if unloaded:
+        gc.collect()
+        print(f"Engine: Unloaded models: {', '.join(unloaded)}")
+    return unloaded
+
+
+def evict_idle_models(max_idle_seconds):
+    """Unloads every model that has not served an inference call within max_idle_seconds."""
+    now = time.time()
+    with _registry_lock:
+        idle = [
+            name for name in _models
+            if (_metrics[name]["last_used"] or 0) < now - max_idle_seconds
+        ]
+    evicted = []
+    for name in idle:
+        evicted.extend(unload_model(name))
+    return evicted
+
+
+def get_model_metrics():
+    """Returns a snapshot of load and inference timings for every registered model."""
+    with _registry_lock:
+        snapshot = {}
+        for name, stats in _metrics.items():
+            calls = stats["calls"]
+            snapshot[name] = dict(
+                stats,
+                loaded=name in _models,
+                avg_inference_seconds=(stats["inference_seconds"] / calls) if calls else 0.0,
+            )
+        return snapshot
@@ -1,40 +1,342 @@
 # engine/processing.py
 
-import fitz # PyMuPDF
+import multiprocessing
 import os
-from transformers import pipeline
-from keybert import KeyBERT
+import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from engine.models import get_summarizer, get_keyword_model, track_inference
+from engine.text_cache import get_default_cache, sha256_bytes, sha256_file
 
-def extract_text_from_pdfs(pdf_folder_path):
+# --- Extraction Settings ---
+PAGES_PER_TASK = 50  # large PDFs are split into page ranges of this size across workers
+# Folders with at most this many uncached pages are extracted in the calling process; only
+# bigger jobs are worth handing to the extraction pool.
+INPROCESS_MAX_PAGES = int(os.environ.get("PDF_INPROCESS_MAX_PAGES", 2 * PAGES_PER_TASK))
+
+# --- Summarization Settings ---
+# BART accepts at most 1024 tokens, so chunks stay below that with room for special tokens.
+CHUNK_MAX_TOKENS = 900
+CHUNK_OVERLAP_TOKENS = 100
+SUMMARY_BATCH_SIZE = 4
+KEYWORD_BATCH_SIZE = 32
+PARTIAL_SUMMARY_LENGTH = (40, 150)  # (min_length, max_length) for each chunk summary
+FINAL_SUMMARY_LENGTH = (100, 250)
+MAX_REDUCE_DEPTH = 5
+
+# A sentence runs up to terminal punctuation followed by whitespace, or to the end of the text.
+_SENTENCE_RE = re.compile(r'.+?(?:[.!?](?=\s)|$)', re.S)
+
+def _extract_page_range(pdf_path, start, stop):
+    """Worker task: extracts the text of pages [start, stop) from a single PDF."""
+    import fitz # PyMuPDF; imported on first use so importing this module stays cheap
+    filename = os.path.basename(pdf_path)
+    with fitz.open(pdf_path) as doc:
+        return [(filename, page_no, doc[page_no].get_text()) for page_no in range(start, stop)]
+
+def _file_jobs(pdf_folder_path, pages_per_task, cache):
+    """
+    Yields (filename, key, cached_pages, ranges) for every PDF in the folder.
+    cached_pages is the list of page texts on a cache hit; otherwise ranges holds the
+    (pdf_path, start, stop) work items needed to extract the file.
+    """
+    import fitz
+    for filename in sorted(os.listdir(pdf_folder_path)):
+        if not filename.endswith(".pdf"):
+            continue
+        pdf_path = os.path.join(pdf_folder_path, filename)
+        key = sha256_file(pdf_path) if cache is not None else None
+        cached_pages = cache.get_pages(key) if cache is not None else None
+        if cached_pages is not None:
+            yield filename, key, cached_pages, []
+            continue
+        try:
+            with fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+        except Exception as e:
+            print(f"⚠️ Skipping unreadable PDF {filename}: {e}")
+            continue
+        ranges = [(pdf_path, start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+        yield filename, key, None, ranges
+
+# One process pool shared by every extraction. Workers are spawned rather than forked, so they
+# start from a fresh interpreter instead of copying the app (loaded models, threads, sockets).
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+def get_extraction_pool():
+    """Returns the shared PDF extraction pool, starting it on first use."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        with _extraction_pool_lock:
+            if _extraction_pool is None:
+                _extraction_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _extraction_pool
+
+def iter_pdf_pages(pdf_folder_path, max_workers=None, pages_per_task=PAGES_PER_TASK, max_bytes=None, cache=None):
+    """
+    Yields (filename, page_no, text) records for every page of every PDF in a folder.
+    Files are listed, hashed and split into page ranges one at a time. The first
+    INPROCESS_MAX_PAGES uncached pages are extracted in this process; beyond that, ranges are
+    extracted in parallel on the shared process pool, with at most 2 * max_workers ranges in
+    flight (even within one large file) so memory stays flat. Records come out
+    in file and page order. If max_bytes is given, extraction stops once that many bytes
+    of UTF-8 text have been produced, truncating the last page to fit.
+    Files already in the PDF text cache are served from it, and freshly extracted files
+    are added to it. Pass cache=False to bypass the cache.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if cache is None:
+        cache = get_default_cache()
+    elif cache is False:
+        cache = None
+    remaining = max_bytes
+    pool = None  # switched to the shared pool once the folder proves big enough
+    uncached_pages = 0
+    # Each entry is (key, is_last_range_of_file, records_or_future)
+    in_flight = deque()
+    pending_pages = []  # pages of the file currently being drained, for the cache
+
+    def _drain_one():
+        nonlocal remaining
+        key, is_last, item = in_flight.popleft()
+        records = item.result() if hasattr(item, "result") else item
+        if key is not None:
+            pending_pages.extend(text for _, _, text in records)
+            if is_last:
+                cache.put_pages(key, list(pending_pages))
+                pending_pages.clear()
+        for filename, page_no, text in records:
+            if remaining is not None:
+                encoded = text.encode("utf-8")
+                if len(encoded) >= remaining:
+                    yield filename, page_no, encoded[:remaining].decode("utf-8", errors="ignore")
+                    remaining = 0
+                    return
+                remaining -= len(encoded)
+            yield filename, page_no, text
+
+    try:
+        for filename, key, cached_pages, ranges in _file_jobs(pdf_folder_path, pages_per_task, cache):
+            if cached_pages is not None:
+                # Already cached: nothing to store again once drained.
+                in_flight.append((None, True, [(filename, page_no, text) for page_no, text in enumerate(cached_pages)]))
+            uncached_pages += sum(stop - start for _, start, stop in ranges)
+            if pool is None and max_workers > 1 and uncached_pages > INPROCESS_MAX_PAGES:
+                pool = get_extraction_pool()
+            for i, task in enumerate(ranges):
+                # Wait for room before every range, so one huge file cannot queue all of its ranges.
+                while in_flight and (pool is None or len(in_flight) >= max_workers * 2):
+                    yield from _drain_one()
+                    if remaining == 0:
+                        return
+                item = pool.submit(_extract_page_range, *task) if pool else _extract_page_range(*task)
+                in_flight.append((key, i == len(ranges) - 1, item))
+        while in_flight:
+            yield from _drain_one()
+            if remaining == 0:
+                return
+    finally:
+        # The pool is shared, so only the tasks of this call are dropped.
+        if pool:
+            for _, _, item in in_flight:
+                item.cancel()
+
+def extract_text_from_pdfs(pdf_folder_path, max_workers=None, max_bytes=None):
     """Extracts text from all PDFs in a given folder."""
-    # ... (code from previous answer) ...
-    full_text = ""
-    for filename in os.listdir(pdf_folder_path):
-        if filename.endswith(".pdf"):
-            with fitz.open(os.path.join(pdf_folder_path, filename)) as doc:
-                for page in doc:
-                    full_text += page.get_text()
-    return full_text
-
-def summarize_text(text):
-    """Generates a summary of the text."""
-    # ... (code from previous answer) ...
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    summary = summarizer(text[:4096], max_length=250, min_length=100, do_sample=False)
-    return summary[0]['summary_text']
+    parts = [text for _, _, text in iter_pdf_pages(pdf_folder_path, max_workers=max_workers, max_bytes=max_bytes)]
+    return "".join(parts)
+
+def extract_text_from_pdf_bytes(pdf_bytes, cache=None):
+    """
+    Extracts the text of an in-memory PDF, going through the content-addressed cache so
+    the same document is only ever parsed once.
+    """
+    cache = cache or get_default_cache()
+    key = sha256_bytes(pdf_bytes)
+    text = cache.get_text(key)
+    if text is None:
+        import fitz
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            pages = [page.get_text() for page in doc]
+        cache.put_pages(key, pages)
+        text = "".join(pages)
+    return text
+
+def iter_sentences(text):
+    """Lazily yields whitespace-normalized sentences from the text."""
+    for match in _SENTENCE_RE.finditer(text):
+        sentence = " ".join(match.group().split())
+        if sentence:
+            yield sentence
+
+def chunk_text(text, tokenizer, max_tokens=CHUNK_MAX_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS):
+    """
+    Yields sentence-aligned chunks of at most max_tokens tokens.
+    Consecutive chunks share up to overlap_tokens worth of trailing sentences so context
+    is not lost at the boundaries. Sentences longer than a whole chunk are split on tokens.
+    """
+    window = []  # (sentence, token_count) pairs in the current chunk
+    window_tokens = 0
+
+    for sentence in iter_sentences(text):
+        token_ids = tokenizer.encode(sentence, add_special_tokens=False)
+        if len(token_ids) > max_tokens:
+            pieces = [
+                (tokenizer.decode(token_ids[i:i + max_tokens]), len(token_ids[i:i + max_tokens]))
+                for i in range(0, len(token_ids), max_tokens)
+            ]
+        else:
+            pieces = [(sentence, len(token_ids))]
+
+        for piece, n_tokens in pieces:
+            if window and window_tokens + n_tokens > max_tokens:
+                yield " ".join(s for s, _ in window)
+                carried, carried_tokens = [], 0
+                for s, count in reversed(window):
+                    if carried_tokens + count > min(overlap_tokens, max_tokens - n_tokens):
+                        break
+                    carried.insert(0, (s, count))
+                    carried_tokens += count
+                window, window_tokens = carried, carried_tokens
+            # A flush is always followed by a new piece, so the last window is never just overlap.
+            window.append((piece, n_tokens))
+            window_tokens += n_tokens
+
+    if window:
+        yield " ".join(s for s, _ in window)
+
+def _summarize_batches(summarizer, chunks, min_length, max_length, batch_size):
+    """Runs the summarizer over an iterable of chunks, batch_size chunks per forward pass."""
+    summaries = []
+    batch = []
+
+    def _flush():
+        with track_inference("summarizer"):
+            outputs = summarizer(batch, min_length=min_length, max_length=max_length, do_sample=False, truncation=True, batch_size=len(batch))
+        summaries.extend(out['summary_text'] for out in outputs)
+        batch.clear()
+
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            _flush()
+    if batch:
+        _flush()
+    return summaries
+
+def summarize_text(text, batch_size=SUMMARY_BATCH_SIZE):
+    """
+    Generates a summary of the text.
+    Long inputs are summarized map-reduce style: the text is streamed through the chunker,
+    chunks are summarized in batches, and the partial summaries are summarized again
+    until they fit into a single final pass.
+    """
+    summarizer = get_summarizer()
+    tokenizer = summarizer.tokenizer
+    final_min, final_max = FINAL_SUMMARY_LENGTH
+    partial_min, partial_max = PARTIAL_SUMMARY_LENGTH
+
+    for depth in range(MAX_REDUCE_DEPTH):
+        chunks = chunk_text(text, tokenizer)
+        first = next(chunks, None)
+        if first is None:
+            return ""
+        second = next(chunks, None)
+        if second is None:
+            # Everything fits into one window: this is the final pass.
+            return _summarize_batches(summarizer, [first], final_min, final_max, 1)[0]
+
+        def _all_chunks():
+            yield first
+            yield second
+            yield from chunks
+
+        partials = _summarize_batches(summarizer, _all_chunks(), partial_min, partial_max, batch_size)
+        print(f"Engine: Reduce level {depth + 1} produced {len(partials)} partial summaries.")
+        text = " ".join(partials)
+
+    # Give up on reducing further and let the pipeline truncate what is left.
+    return _summarize_batches(summarizer, [text], final_min, final_max, 1)[0]
+
+def summarize_many(texts, batch_size=SUMMARY_BATCH_SIZE):
+    """
+    Summarizes a list of documents, returning one summary per input in the same order.
+    Documents that fit into a single window are sorted by token length and batched so each
+    forward pass pads as little as possible; longer documents go through summarize_text.
+    """
+    summarizer = get_summarizer()
+    tokenizer = summarizer.tokenizer
+    final_min, final_max = FINAL_SUMMARY_LENGTH
+    summaries = [""] * len(texts)
+
+    short_docs = []  # (token_count, index)
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        n_tokens = len(tokenizer.encode(text, add_special_tokens=False))
+        if n_tokens <= CHUNK_MAX_TOKENS:
+            short_docs.append((n_tokens, i))
+        else:
+            summaries[i] = summarize_text(text, batch_size=batch_size)
+
+    short_docs.sort(reverse=True)
+    for start in range(0, len(short_docs), batch_size):
+        indices = [i for _, i in short_docs[start:start + batch_size]]
+        batch = [texts[i] for i in indices]
+        for i, summary in zip(indices, _summarize_batches(summarizer, batch, final_min, final_max, len(batch))):
+            summaries[i] = summary
+    return summaries
+
+def extract_keywords_many(texts, batch_size=KEYWORD_BATCH_SIZE, top_n=15, doc_ids=None):
+    """
+    Extracts keywords for a list of documents, returning one keyword list per input.
+    Document embeddings are computed up front in batches of batch_size so KeyBERT only has
+    to embed the candidate phrases, which it does in a single pass for the whole list.
+    If doc_ids (one per text) are given, the document embeddings are also added to the
+    local vector index under those ids instead of being thrown away (written on its next save()).
+    """
+    indices = [i for i, text in enumerate(texts) if text and text.strip()]
+    results = [[] for _ in texts]
+    if not indices:
+        return results
+
+    docs = [texts[i] for i in indices]
+    kw_model = get_keyword_model()
+    with track_inference("keywords"):
+        # SentenceTransformer.encode sorts by length internally to minimise padding.
+        doc_embeddings = kw_model.model.embedding_model.encode(docs, batch_size=batch_size, show_progress_bar=False)
+        keywords = kw_model.extract_keywords(
+            docs, keyphrase_ngram_range=(1, 3), stop_words='english', top_n=top_n, doc_embeddings=doc_embeddings
+        )
+    # KeyBERT returns a flat list instead of a list of lists when given a single document.
+    if len(docs) == 1:
+        keywords = [keywords]
+    for i, doc_keywords in zip(indices, keywords):
+        results[i] = [kw[0] for kw in doc_keywords]
+
+    if doc_ids:
+        # Imported here because the vector index itself builds on this module.
+        from engine.vector_index import get_default_vector_index
+        vector_index = get_default_vector_index()
+        vector_index.add(doc_embeddings, [
+            {'url': doc_ids[i], 'title': '', 'chunk': 'document', 'text': texts[i][:300]} for i in indices
+        ])
+    return results
 
 def extract_keywords(text):
     """Extracts keywords and keyphrases from the text."""
-    # ... (code from previous answer) ...
-    kw_model = KeyBERT()
-    keywords = kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 3), stop_words='english', top_n=15)
-    return [kw[0] for kw in keywords]
+    return extract_keywords_many([text])[0]
 
 # --- Master Function ---
 def run_nlp_pipeline(pdf_folder_path):
     """
     Runs the full text processing pipeline.
     This is the main function the app will call.
+    Models come from the shared registry, so only the first run pays the loading cost.
     """
     print("Step 1: Extracting text from PDFs...")
     full_text = extract_text_from_pdfs(pdf_folder_path)
@@ -1,3 +1,4 @@
+import os
 import time
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -9,6 +10,9 @@ from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Can be pointed at a local stand-in (see benchmarks/mock_server.py).
+NTRS_SEARCH_URL = os.environ.get("NTRS_SEARCH_URL", "https://ntrs.nasa.gov/search")
+
 def get_abstract(driver):
     """Helper function to find an abstract on a page from a list of selectors."""
     selectors = [
@@ -42,7 +46,7 @@ def scrape_nslsl(keyword, max_pages=2):
         driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
         wait = WebDriverWait(driver, 20)
         # NOTE: The old NSLSL URL is deprecated. This points to the modern NTRS.
-        base_url = "https://ntrs.nasa.gov/search"
+        base_url = NTRS_SEARCH_URL
         
         driver.get(base_url)
         
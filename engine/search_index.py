@@ -0,0 +1,261 @@
+# engine/search_index.py
+
+import gzip
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+
+DEFAULT_INDEX_PATH = os.environ.get("SEARCH_INDEX_PATH", os.path.join("cache", "search_index.sqlite3"))
+# Indexes written by earlier versions (one gzipped JSON file) are imported on first open.
+LEGACY_INDEX_PATH = os.path.join("cache", "search_index.json.gz")
+# Term frequencies are weighted per field, so a match in the title counts more than one in the body.
+FIELD_WEIGHTS = {"title": 3, "abstract": 2, "text": 1}
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were which with".split()
+)
+
+
+def tokenize(text):
+    """Lowercases text and splits it into index terms, dropping stop words and single characters."""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in _STOP_WORDS]
+
+
+def _merge_fields(previous, title, abstract, body_tf):
+    """Fills the empty fields of an update from the previous version of the document."""
+    return (
+        title or previous["title"],
+        abstract or previous["abstract"],
+        # The raw text is not stored, so an update without text keeps the old body frequencies.
+        body_tf or Counter(previous["body_tf"]),
+    )
+
+
+def _build_doc(url, title, abstract, body_tf):
+    tf = Counter()
+    for field, value in (("title", title), ("abstract", abstract)):
+        for term, count in Counter(tokenize(value)).items():
+            tf[term] += count * FIELD_WEIGHTS[field]
+    for term, count in body_tf.items():
+        tf[term] += count * FIELD_WEIGHTS["text"]
+    return {
+        "url": url,
+        "title": title,
+        "abstract": abstract,
+        "has_text": bool(body_tf),
+        "body_tf": dict(body_tf),
+        "length": sum(tf.values()),
+        "tf": dict(tf),
+    }
+
+
+class SearchIndex:
+    """
+    Inverted index with BM25 ranking over document titles, abstracts and extracted PDF text.
+
+    Documents are keyed by URL and can be updated incrementally: adding the PDF text of a
+    document that is already indexed (by its abstract) merges the two. Documents are stored
+    as rows of a SQLite table, so save() only writes the documents changed since the last
+    save, merging them with whatever other processes stored meanwhile. Every row carries a
+    revision number; before searching, rows newer than the last one seen are loaded, so
+    documents indexed by another process (e.g. the bulk ingest) show up without a restart.
+    Only per-document term frequencies are stored; the postings lists live in memory.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.docs = {}  # url -> {'title', 'url', 'abstract', 'has_text', 'body_tf', 'length', 'tf'}
+        self.postings = {}  # term -> {url: weighted term frequency}
+        self.total_length = 0
+        self._pending = {}  # url -> (title, abstract, body_tf) added since the last save
+        self._rev = 0  # highest stored revision merged into memory
+        self._lock = threading.RLock()
+        self._conn = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS documents (
+                    url TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    abstract TEXT NOT NULL,
+                    body_tf BLOB NOT NULL,
+                    rev INTEGER NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS documents_rev ON documents(rev)")
+            self._import_legacy()
+            self.refresh()
+
+    # --- Persistence ---
+    def _import_legacy(self):
+        """Copies an index saved by earlier versions (one gzipped JSON list) into the table once."""
+        if not os.path.exists(LEGACY_INDEX_PATH) or self._conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone():
+            return
+        with gzip.open(LEGACY_INDEX_PATH, "rt", encoding="utf-8") as f:
+            docs = json.load(f)
+        for doc in docs:
+            self._pending[doc["url"]] = (doc["title"], doc["abstract"], Counter(doc.get("body_tf", {})))
+        self.save()
+        print(f"📚 Imported {len(docs)} documents from {LEGACY_INDEX_PATH}.")
+
+    def refresh(self):
+        """Loads documents stored (by any process) since the last refresh; returns how many."""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, title, abstract, body_tf, rev FROM documents WHERE rev > ? ORDER BY rev", (self._rev,)
+            ).fetchall()
+            for url, title, abstract, body_tf, rev in rows:
+                stored = _build_doc(url, title, abstract, Counter(json.loads(zlib.decompress(body_tf))))
+                if url in self._pending:
+                    # Unsaved local changes stay on top of the stored version.
+                    stored = _build_doc(url, *_merge_fields(stored, *self._pending[url]))
+                self._remove(url)
+                self._insert(stored)
+                self._rev = rev
+        return len(rows)
+
+    def save(self):
+        """
+        Writes the documents added since the last save in one transaction. Each is merged with
+        the row currently stored for its URL, so concurrent writers never drop each other's updates.
+        """
+        if self._conn is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                rev = self._conn.execute("SELECT COALESCE(MAX(rev), 0) FROM documents").fetchone()[0]
+                for url, fields in pending.items():
+                    row = self._conn.execute("SELECT title, abstract, body_tf FROM documents WHERE url = ?", (url,)).fetchone()
+                    if row is not None:
+                        stored = {"title": row[0], "abstract": row[1], "body_tf": json.loads(zlib.decompress(row[2]))}
+                        fields = _merge_fields(stored, *fields)
+                    title, abstract, body_tf = fields
+                    rev += 1
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO documents (url, title, abstract, body_tf, rev) VALUES (?, ?, ?, ?, ?)",
+                        (url, title, abstract, zlib.compress(json.dumps(dict(body_tf), separators=(",", ":")).encode("utf-8")), rev),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._pending = {**pending, **self._pending}
+                raise
+            self.refresh()
+
+    # --- Updates ---
+    def _insert(self, doc):
+        self.docs[doc["url"]] = doc
+        self.total_length += doc["length"]
+        for term, tf in doc["tf"].items():
+            self.postings.setdefault(term, {})[doc["url"]] = tf
+
+    def _remove(self, url):
+        doc = self.docs.pop(url, None)
+        if doc is None:
+            return None
+        self.total_length -= doc["length"]
+        for term in doc["tf"]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(url, None)
+                if not postings:
+                    del self.postings[term]
+        return doc
+
+    def add_document(self, url, title="", abstract="", text=""):
+        """
+        Adds or updates a document (in memory until save()). Fields left empty keep their
+        previously indexed content, so abstracts and PDF text fetched at different times end
+        up in the same entry.
+        """
+        fields = (title, abstract, Counter(tokenize(text)))
+        with self._lock:
+            previous = self._remove(url)
+            merged = _merge_fields(previous, *fields) if previous is not None else fields
+            self._insert(_build_doc(url, *merged))
+            if url in self._pending:
+                fields = _merge_fields(dict(zip(("title", "abstract", "body_tf"), self._pending[url])), *fields)
+            self._pending[url] = fields
+
+    # --- Queries ---
+    def search(self, query, top_k=10):
+        """Returns the top_k documents ranked by BM25 score, highest first."""
+        terms = tokenize(query)
+        self.refresh()
+        with self._lock:
+            n_docs = len(self.docs)
+            if not terms or not n_docs:
+                return []
+            avg_length = self.total_length / n_docs
+            scores = Counter()
+            for term in set(terms):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for url, tf in postings.items():
+                    length_norm = 1 - BM25_B + BM25_B * self.docs[url]["length"] / avg_length
+                    scores[url] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+
+            return [
+                {
+                    "title": self.docs[url]["title"],
+                    "url": url,
+                    "abstract": self.docs[url]["abstract"],
+                    "score": score,
+                }
+                for url, score in scores.most_common(top_k)
+            ]
+
+    def __len__(self):
+        return len(self.docs)
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_index():
+    """Returns the process-wide search index, loading it from disk on first use (later changes are picked up by search())."""
+    global _default_index
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                _default_index = SearchIndex()
+    return _default_index
+
+
+def index_documents(documents, text_by_url=None, save=True):
+    """
+    Adds scraped documents ({'title', 'url', 'abstract'}) and optional extracted text to the
+    default index. Indexing problems are reported but never interrupt the scraper.
+    """
+    try:
+        index = get_default_index()
+        text_by_url = text_by_url or {}
+        for doc in documents:
+            abstract = doc.get("abstract", "")
+            if abstract.startswith(("No abstract", "An error occurred")):
+                abstract = ""
+            index.add_document(doc["url"], doc.get("title", ""), abstract, text_by_url.get(doc["url"], ""))
+        if save:
+            index.save()
+    except Exception as e:
+        print(f"⚠️ Could not update the local search index: {e}")
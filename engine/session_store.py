@@ -0,0 +1,127 @@
+# engine/session_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+
+DEFAULT_DB_PATH = os.environ.get("SESSION_STORE_PATH", os.path.join("cache", "sessions.sqlite3"))
+DEFAULT_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", 2 * 3600))
+# Expired sessions are purged at most this often, piggybacking on writes.
+PURGE_INTERVAL_SECONDS = 60
+
+
+class SessionStore:
+    """
+    Server-side storage for per-browser-session data (uploads, search results, summaries).
+
+    Values are JSON-serialised, zlib-compressed and stored in SQLite keyed by
+    (session_id, key), so every web worker process sees the same data and only the session
+    ID has to travel in the browser's dcc.Store. A session expires ttl_seconds after it was
+    last read or written.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS session_data (
+                session_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (session_id, key)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS session_data_last_access ON session_data(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def new_session_id():
+        return uuid.uuid4().hex
+
+    def get_many(self, session_id, keys):
+        """Returns {key: value} for the requested keys; missing or expired keys map to None."""
+        values = dict.fromkeys(keys)
+        if not session_id or not keys:
+            return values
+        now = time.time()
+        placeholders = ", ".join("?" for _ in keys)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM session_data WHERE session_id = ? AND key IN ({placeholders}) AND last_access >= ?",
+                (session_id, *keys, now - self.ttl_seconds),
+            ).fetchall()
+            # Reading keeps the whole session alive, not just the keys that were read.
+            self._conn.execute("UPDATE session_data SET last_access = ? WHERE session_id = ?", (now, session_id))
+            self._conn.commit()
+        for key, value in rows:
+            values[key] = json.loads(zlib.decompress(value))
+        return values
+
+    def get(self, session_id, key, default=None):
+        value = self.get_many(session_id, [key])[key]
+        return default if value is None else value
+
+    def set(self, session_id, **fields):
+        """Stores the given fields for a session; a value of None deletes the key."""
+        now = time.time()
+        with self._lock:
+            for key, value in fields.items():
+                if value is None:
+                    self._conn.execute("DELETE FROM session_data WHERE session_id = ? AND key = ?", (session_id, key))
+                    continue
+                body = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO session_data (session_id, key, value, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (session_id, key, body, len(body), now),
+                )
+            if now - self._last_purge >= PURGE_INTERVAL_SECONDS:
+                self._last_purge = now
+                self._purge_expired(now)
+            self._conn.commit()
+
+    def clear(self, session_id):
+        """Deletes everything stored for a session."""
+        with self._lock:
+            self._conn.execute("DELETE FROM session_data WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def _purge_expired(self, now):
+        self._conn.execute(
+            """DELETE FROM session_data WHERE session_id IN (
+                SELECT session_id FROM session_data GROUP BY session_id HAVING MAX(last_access) < ?
+            )""",
+            (now - self.ttl_seconds,),
+        )
+
+    def stats(self):
+        """Returns the number of live sessions and the size of the stored values."""
+        with self._lock:
+            sessions, entries, size = self._conn.execute(
+                "SELECT COUNT(DISTINCT session_id), COUNT(*), COALESCE(SUM(size), 0) FROM session_data"
+            ).fetchone()
+        return {"sessions": sessions, "entries": entries, "size_bytes": size, "ttl_seconds": self.ttl_seconds}
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """Returns the process-wide session store, creating it on first use."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = SessionStore()
+    return _default_store
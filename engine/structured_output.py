@@ -0,0 +1,174 @@
+# engine/structured_output.py
+
+import json
+import math
+import re
+
+# --- Response schemas (the OpenAPI subset accepted by Gemini's generationConfig.responseSchema) ---
+DISTRIBUTION_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"area": {"type": "STRING"}, "score": {"type": "NUMBER"}},
+        "required": ["area", "score"],
+    },
+}
+GRAPH_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "nodes": {"type": "ARRAY", "items": {
+            "type": "OBJECT",
+            "properties": {"id": {"type": "STRING"}, "label": {"type": "STRING"}},
+            "required": ["id", "label"],
+        }},
+        "edges": {"type": "ARRAY", "items": {
+            "type": "OBJECT",
+            "properties": {"source": {"type": "STRING"}, "target": {"type": "STRING"}},
+            "required": ["source", "target"],
+        }},
+    },
+    "required": ["nodes", "edges"],
+}
+# Audience keys of the fused response -> the tab names used by the dashboard's actionable insights.
+ACTIONABLE_AUDIENCES = {"mission_architects": "Mission Architects", "scientists": "Scientists", "managers": "Managers"}
+FUSED_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "STRING"},
+        "distribution": DISTRIBUTION_SCHEMA,
+        "graph": GRAPH_SCHEMA,
+        "actionable": {
+            "type": "OBJECT",
+            "properties": {key: {"type": "STRING"} for key in ACTIONABLE_AUDIENCES},
+            "required": list(ACTIONABLE_AUDIENCES),
+        },
+    },
+    "required": ["summary", "distribution", "graph", "actionable"],
+}
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+# A JSON string literal, or a comma followed only by whitespace before a closing bracket.
+_STRING_OR_TRAILING_COMMA_RE = re.compile(r'"(?:[^"\\]|\\.)*"|,(?=\s*[}\]])', re.S)
+
+
+def _strip_trailing_commas(text):
+    """Removes trailing commas before } and ], leaving string values untouched."""
+    return _STRING_OR_TRAILING_COMMA_RE.sub(lambda m: m.group() if m.group() != "," else "", text)
+
+
+def parse_json_text(text):
+    """
+    Parses the JSON value in a model response. Tolerates markdown fences, prose around the
+    value and, as a last resort, trailing commas; raises ValueError if no JSON object or array can be decoded.
+    """
+    if not text or not text.strip():
+        raise ValueError("the response is empty")
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    fenced = _FENCE_RE.search(text)
+    candidates = [fenced.group(1)] if fenced else []
+    candidates.append(text)
+    # Every candidate is tried unchanged before any of them is rewritten.
+    candidates += [_strip_trailing_commas(candidate) for candidate in candidates]
+    decoder = json.JSONDecoder()
+    for candidate in candidates:
+        # Decode from the first opening bracket and ignore whatever follows the value.
+        starts = [i for i in (candidate.find("{"), candidate.find("[")) if i >= 0]
+        if not starts:
+            continue
+        try:
+            return decoder.raw_decode(candidate, min(starts))[0]
+        except ValueError:
+            continue
+    raise ValueError("the response does not contain valid JSON")
+
+
+def _score(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    return score if math.isfinite(score) and score >= 0 else None
+
+
+def validate_distribution(data):
+    """
+    Returns {area: score} from a DISTRIBUTION_SCHEMA list (or the older {area: score} object).
+    Entries without a name or a finite, non-negative score are dropped; raises ValueError if none are left.
+    """
+    if isinstance(data, dict):
+        data = [{"area": area, "score": score} for area, score in data.items()]
+    if not isinstance(data, list):
+        raise ValueError(f"expected a list of areas, got {type(data).__name__}")
+
+    scores = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        area, score = str(item.get("area") or "").strip(), _score(item.get("score"))
+        if area and score is not None and area not in scores:
+            scores[area] = score
+    if not scores:
+        raise ValueError("no research area has a name and a numeric score")
+    return scores
+
+
+def validate_graph(data):
+    """
+    Returns dash-cytoscape elements from a GRAPH_SCHEMA object (or an older element list).
+    Node IDs are made unique, and edges that are self-loops, duplicates or point at
+    unknown nodes are dropped; raises ValueError if there is no node.
+    """
+    if isinstance(data, list):
+        entries = [item.get("data", {}) for item in data if isinstance(item, dict)]
+        data = {
+            "nodes": [entry for entry in entries if "source" not in entry],
+            "edges": [entry for entry in entries if "source" in entry],
+        }
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a graph object, got {type(data).__name__}")
+
+    nodes = {}
+    for node in data.get("nodes") or []:
+        if not isinstance(node, dict):
+            continue
+        node_id = str(node.get("id") or "").strip()
+        if node_id and node_id not in nodes:
+            nodes[node_id] = str(node.get("label") or node_id).strip()
+    if not nodes:
+        raise ValueError("the graph has no nodes")
+
+    edges = []
+    for edge in data.get("edges") or []:
+        if not isinstance(edge, dict):
+            continue
+        pair = (str(edge.get("source") or "").strip(), str(edge.get("target") or "").strip())
+        if pair[0] in nodes and pair[1] in nodes and pair[0] != pair[1] and pair not in edges:
+            edges.append(pair)
+
+    return [{"data": {"id": node_id, "label": label}} for node_id, label in nodes.items()] + \
+        [{"data": {"source": source, "target": target}} for source, target in edges]
+
+
+def validate_fused_analysis(data):
+    """
+    Validates a FUSED_ANALYSIS_SCHEMA object and returns {'summary', 'distribution' ({area: score}),
+    'graph_elements', 'actionable' ({audience tab name: text})}. Raises ValueError if any part is unusable.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"expected an analysis object, got {type(data).__name__}")
+    summary = data.get("summary")
+    if not isinstance(summary, str) or not summary.strip():
+        raise ValueError("the summary is missing")
+    actionable = data.get("actionable") if isinstance(data.get("actionable"), dict) else {}
+    return {
+        "summary": summary.strip(),
+        "distribution": validate_distribution(data.get("distribution")),
+        "graph_elements": validate_graph(data.get("graph")),
+        "actionable": {name: str(actionable.get(key) or "N/A").strip() for key, name in ACTIONABLE_AUDIENCES.items()},
+    }
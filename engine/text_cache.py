@@ -0,0 +1,161 @@
+# engine/text_cache.py
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_CACHE_DIR = os.environ.get("PDF_TEXT_CACHE_DIR", os.path.join("cache", "pdf_text"))
+DEFAULT_MAX_BYTES = int(os.environ.get("PDF_TEXT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+_SUFFIX = ".json.gz"
+
+
+def sha256_bytes(data):
+    """Returns the hex SHA-256 digest of a bytes-like object."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    """Returns the hex SHA-256 digest of a file without loading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _size_or_zero(path):
+    """Size of a file, or 0 if it does not exist (any longer)."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class PdfTextCache:
+    """
+    Content-addressed on-disk cache of extracted PDF text.
+
+    Entries are keyed by the SHA-256 of the PDF bytes and stored as gzipped JSON holding
+    the concatenated text plus the offset at which each page starts. When the cache grows
+    beyond max_bytes the least recently used entries (by file mtime) are evicted.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(stat.st_size for _, stat in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + _SUFFIX)
+
+    def _entries(self):
+        """Returns (path, stat) of every entry; entries removed meanwhile (e.g. by another process) are skipped."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                entries.append((path, os.stat(path)))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def get_pages(self, key):
+        """Returns the cached list of page texts for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        text, offsets = entry["text"], entry["page_offsets"]
+        bounds = offsets[1:] + [len(text)]
+        return [text[start:stop] for start, stop in zip(offsets, bounds)]
+
+    def get_text(self, key):
+        """Returns the cached full text for a key, or None on a miss."""
+        pages = self.get_pages(key)
+        return "".join(pages) if pages is not None else None
+
+    def put_pages(self, key, pages):
+        """Stores the page texts of a PDF under its content hash and evicts old entries if needed."""
+        offsets, position = [], 0
+        for page in pages:
+            offsets.append(position)
+            position += len(page)
+        entry = {"text": "".join(pages), "page_offsets": offsets}
+
+        path = self._path(key)
+        # Other processes (the extraction pool, the ingest CLI) may write the same entry at the same time.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(entry, f, separators=(",", ":"))
+
+        with self._lock:
+            old_size = _size_or_zero(path)
+            os.replace(tmp_path, path)
+            self._size += _size_or_zero(path) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits its budget. Caller holds the lock."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        # Other processes share the directory, so the size is recounted from what is on disk.
+        self._size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass  # already evicted by another process
+            except OSError:
+                continue
+            self._size -= stat.st_size
+
+    def stats(self):
+        """Returns hit/miss/eviction counters and the current on-disk size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Returns the process-wide PDF text cache, creating it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = PdfTextCache()
+    return _default_cache
@@ -0,0 +1,566 @@
+# engine/vector_index.py
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from engine.models import get_keyword_model, track_inference
+from engine.processing import iter_sentences
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, so only one process should write at a time
+    fcntl = None
+
+DEFAULT_INDEX_DIR = os.environ.get("VECTOR_INDEX_DIR", os.path.join("cache", "vectors"))
+# Embedding while scraping loads the sentence-transformer, so it is opt-in for the web app.
+SEMANTIC_INDEXING = os.environ.get("SEMANTIC_INDEXING") == "1"
+EMBED_BATCH_SIZE = 64
+CHUNK_WORDS = 200  # PDF text is embedded in windows of roughly this many words
+SEARCH_BLOCK_ROWS = 8192  # rows dequantized per matrix product; small enough to stay in cache
+IVF_MIN_ROWS = 20000  # below this a brute-force scan is already fast enough
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "lock"
+# Segments are merged into one when there are more than this many, or when more than
+# this fraction of the rows have been replaced by newer ones.
+MAX_SEGMENTS = 16
+COMPACT_DELETED_FRACTION = 0.25
+
+
+def encode_texts(texts, batch_size=EMBED_BATCH_SIZE):
+    """Embeds texts with KeyBERT's sentence-transformer, returning unit-length float32 rows."""
+    kw_model = get_keyword_model()
+    with track_inference("keywords"):
+        vectors = kw_model.model.embedding_model.encode(
+            list(texts), batch_size=batch_size, show_progress_bar=False, normalize_embeddings=True
+        )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def chunk_words(text, max_words=CHUNK_WORDS):
+    """Yields sentence-aligned chunks of roughly max_words words for embedding."""
+    chunk, count = [], 0
+    for sentence in iter_sentences(text):
+        words = len(sentence.split())
+        if chunk and count + words > max_words:
+            yield " ".join(chunk)
+            chunk, count = [], 0
+        chunk.append(sentence)
+        count += words
+    if chunk:
+        yield " ".join(chunk)
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    """
+    Persistent store of document embeddings with top-k cosine search.
+
+    Vectors are kept unit-length and stored quantized (float16, or int8 with a per-row
+    scale) in .npy files that are memory-mapped on load, so the corpus does not have to
+    fit in RAM. Each save() writes the rows added since the previous one as a new,
+    immutable segment and appends it to the manifest, which lists the segments in order;
+    segments are merged once there are more than MAX_SEGMENTS of them or too many replaced
+    rows. Rows are keyed by (url, chunk): adding a key again replaces its row instead of
+    duplicating it. Several processes can share the directory: manifest changes are made
+    under a file lock against the manifest currently on disk, and search() first loads the
+    segments other processes saved. For large corpora build_ivf() clusters the rows so a
+    query only scans the lists closest to it.
+    """
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR, dtype="float16"):
+        if dtype not in ("float16", "int8"):
+            raise ValueError("dtype must be 'float16' or 'int8'")
+        self.index_dir = index_dir
+        self.dtype = dtype
+        self.meta = []  # one dict per row: {'id', 'url', 'title', 'chunk', 'text', 'digest'}
+        self.segments = []  # [{'name', 'files', 'start', 'vectors', 'scales'}] of memory-mapped stored rows
+        self.centroids = None  # IVF centroids, or None for brute-force search
+        self.assignments = None  # IVF list of every row
+        self._lists = None  # IVF list id -> array of row numbers
+        self._pending = []  # rows added since the last save, as float32
+        self._replaced = []  # for every pending row, the row it replaced (or None)
+        self._deleted = set()  # row numbers replaced by a newer row with the same key
+        self._rows_by_key = {}  # (url, chunk) -> live row number
+        self._ivf_name = None  # IVF file of the manifest the stored rows come from
+        self._ivf_dirty = False
+        self._manifest_stamp = None  # identity of the manifest file last read or written
+        self._lock = threading.RLock()
+        if os.path.exists(self._path(MANIFEST_NAME)) or os.path.exists(self._path("meta.json")):
+            self.load()
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    @property
+    def n_stored(self):
+        return len(self.meta) - len(self._pending)
+
+    # --- Persistence ---
+    @contextmanager
+    def _file_lock(self, shared=False):
+        """Serializes manifest changes between processes; readers share the lock."""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self._path(LOCK_NAME), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self._path(MANIFEST_NAME))
+        except FileNotFoundError:
+            return None
+        # The manifest is replaced, never edited, so a new version also has a new inode.
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_manifest(self):
+        """Returns the manifest on disk, or None if the index was never saved."""
+        stamp = self._stamp()
+        if stamp is None:
+            return None
+        with open(self._path(MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self._manifest_stamp = stamp
+        return manifest
+
+    def _write_json(self, name, value):
+        with open(self._path(f"{name}.tmp"), "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(self._path(f"{name}.tmp"), self._path(name))
+
+    def _write_npy(self, name, array):
+        with open(self._path(f"{name}.tmp"), "wb") as f:
+            np.save(f, array)
+        os.replace(self._path(f"{name}.tmp"), self._path(name))
+
+    @staticmethod
+    def _segment_files(name):
+        return [f"seg-{name}.npy", f"seg-{name}.scales.npy", f"seg-{name}.json"]
+
+    def _open_segment(self, name, files=None, rows=None):
+        files = files or self._segment_files(name)
+        if rows is None:
+            with open(self._path(files[2]), encoding="utf-8") as f:
+                rows = json.load(f)["rows"]
+        vectors = np.load(self._path(files[0]), mmap_mode="r")
+        scales = np.load(self._path(files[1]), mmap_mode="r") if self.dtype == "int8" else None
+        self.segments.append({"name": name, "files": files, "start": len(self.meta), "vectors": vectors, "scales": scales})
+        # Replaced rows are not recorded anywhere: a later row with the same key supersedes them on load.
+        for i, meta in enumerate(rows):
+            self._track(dict(meta, id=self.segments[-1]["start"] + i))
+
+    def _track(self, meta):
+        """Appends a row's metadata; an older live row with the same key becomes deleted. Returns the replaced row."""
+        self.meta.append(meta)
+        key = (meta.get("url"), meta.get("chunk"))
+        if None in key:
+            return None
+        previous = self._rows_by_key.get(key)
+        if previous is not None:
+            self._deleted.add(previous)
+        self._rows_by_key[key] = meta["id"]
+        return previous
+
+    def _untrack(self, meta, replaced):
+        """Reverts _track for the newest row, making the row it replaced live again."""
+        self.meta.pop()
+        key = (meta.get("url"), meta.get("chunk"))
+        if None in key:
+            return
+        if replaced is None:
+            self._rows_by_key.pop(key, None)
+        else:
+            self._rows_by_key[key] = replaced
+            self._deleted.discard(replaced)
+
+    def _append_rows(self, rows, metas):
+        """Adds unsaved rows (float32, unit-length) after every row already in memory."""
+        for row, meta in zip(rows, metas):
+            self._replaced.append(self._track(dict(meta, id=len(self.meta))))
+            self._pending.append(row[None, :])
+        if self.centroids is not None and len(rows):
+            extra = np.argmax(rows @ self.centroids.T, axis=1)
+            self._set_ivf(self.centroids, np.concatenate([self.assignments, extra]))
+
+    def _assign_stored(self, assignments):
+        """IVF lists of the stored rows: the given ones for the first rows, the nearest centroid for the rest."""
+        assignments = np.asarray(assignments if assignments is not None else [], dtype=np.int32)[:len(self.meta)]
+        missing = np.arange(len(assignments), len(self.meta))
+        blocks = [
+            np.argmax(self._stored_rows(missing[start:start + SEARCH_BLOCK_ROWS]) @ self.centroids.T, axis=1)
+            for start in range(0, len(missing), SEARCH_BLOCK_ROWS)
+        ]
+        return np.concatenate([assignments, *blocks]).astype(np.int32)
+
+    def _sync(self, manifest):
+        """
+        Brings the stored rows in line with a manifest read under the file lock; unsaved rows are
+        kept and renumbered to follow them. Returns True if anything changed.
+        """
+        if manifest is None:
+            return False
+        names, loaded = manifest["segments"], [seg["name"] for seg in self.segments]
+        if names == loaded and manifest.get("ivf") == self._ivf_name:
+            return False
+
+        pending_metas, pending_rows = self.meta[self.n_stored:], self._pending
+        for meta, replaced in reversed(list(zip(pending_metas, self._replaced))):
+            self._untrack(meta, replaced)
+        self._pending, self._replaced = [], []
+        assignments = self.assignments[:len(self.meta)] if self.assignments is not None else None
+        if names[:len(loaded)] != loaded:
+            # Another process compacted the index, which renumbers every row: start over.
+            self.meta, self.segments, self._deleted, self._rows_by_key = [], [], set(), {}
+            assignments, loaded = None, []
+        self.dtype = manifest["dtype"]
+        for name in names[len(loaded):]:
+            self._open_segment(name)
+
+        ivf_name = manifest.get("ivf")
+        if ivf_name != self._ivf_name:
+            if ivf_name:
+                # IVF files cover the rows that existed when they were written; newer rows are assigned below.
+                with np.load(self._path(f"ivf-{ivf_name}.npz")) as ivf:
+                    self.centroids, assignments = np.asarray(ivf["centroids"], dtype=np.float32), ivf["assignments"]
+            self._ivf_name, self._ivf_dirty = ivf_name, self.centroids is not None and not ivf_name
+        if self.centroids is not None:
+            self._set_ivf(self.centroids, self._assign_stored(assignments))
+        if pending_metas:
+            self._append_rows(np.vstack(pending_rows), pending_metas)
+        return True
+
+    def refresh(self):
+        """Loads the segments other processes saved since the manifest was last read; returns True if anything changed."""
+        stamp = self._stamp()
+        if stamp is None or stamp == self._manifest_stamp:
+            return False
+        with self._lock, self._file_lock(shared=True):
+            return self._sync(self._read_manifest())
+
+    def load(self):
+        """Reads the index from disk, dropping rows that were not saved."""
+        with self._lock:
+            self.meta, self.segments, self._pending, self._replaced = [], [], [], []
+            self._deleted, self._rows_by_key = set(), {}
+            self.centroids = self.assignments = self._lists = None
+            self._ivf_name, self._ivf_dirty = None, False
+            if os.path.exists(self._path(MANIFEST_NAME)):
+                with self._file_lock(shared=True):
+                    self._sync(self._read_manifest())
+                return
+            with self._file_lock():
+                manifest = self._read_manifest()
+                if manifest is not None:
+                    # Another process converted the old layout while this one waited for the lock.
+                    self._sync(manifest)
+                    return
+                # Single-file layout of earlier versions; rewritten as a segment (which also drops
+                # the duplicate rows they appended for repeated documents).
+                with open(self._path("meta.json"), encoding="utf-8") as f:
+                    header = json.load(f)
+                self.dtype = header["dtype"]
+                self._open_segment("legacy", ["vectors.npy", "scales.npy", "meta.json"], header["rows"])
+                if os.path.exists(self._path("ivf.npz")):
+                    with np.load(self._path("ivf.npz")) as ivf:
+                        self._set_ivf(ivf["centroids"], ivf["assignments"])
+                self._compact_locked()
+                if os.path.exists(self._path("ivf.npz")):
+                    os.remove(self._path("ivf.npz"))
+
+    def _quantize(self, rows):
+        if self.dtype == "float16":
+            return rows.astype(np.float16), None
+        scales = np.maximum(np.abs(rows).max(axis=1), 1e-12) / 127.0
+        return np.round(rows / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def _write_segment(self):
+        """Writes the pending rows as a new segment (not yet listed in the manifest)."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        # Names only have to be unique; the manifest defines the order of the segments.
+        name = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        files = self._segment_files(name)
+        start = self.n_stored
+        rows, scales = self._quantize(np.vstack(self._pending))
+        self._write_npy(files[0], rows)
+        if scales is not None:
+            self._write_npy(files[1], scales)
+        self._write_json(files[2], {"rows": [{k: v for k, v in meta.items() if k != "id"} for meta in self.meta[start:]]})
+        self.segments.append({
+            "name": name, "files": files, "start": start,
+            "vectors": np.load(self._path(files[0]), mmap_mode="r"),
+            "scales": np.load(self._path(files[1]), mmap_mode="r") if scales is not None else None,
+        })
+        self._pending, self._replaced = [], []
+
+    def _write_manifest(self):
+        """Lists the segments in memory (and a rebuilt IVF) in the manifest; call with the file lock held."""
+        previous_ivf = None
+        if self._ivf_dirty and self.centroids is not None:
+            previous_ivf, self._ivf_name = self._ivf_name, uuid.uuid4().hex[:12]
+            with open(self._path(f"ivf-{self._ivf_name}.npz.tmp"), "wb") as f:
+                np.savez(f, centroids=self.centroids, assignments=self.assignments[:self.n_stored])
+            os.replace(self._path(f"ivf-{self._ivf_name}.npz.tmp"), self._path(f"ivf-{self._ivf_name}.npz"))
+            self._ivf_dirty = False
+        self._write_json(MANIFEST_NAME, {
+            "dtype": self.dtype, "segments": [seg["name"] for seg in self.segments], "ivf": self._ivf_name,
+        })
+        self._manifest_stamp = self._stamp()
+        if previous_ivf and os.path.exists(self._path(f"ivf-{previous_ivf}.npz")):
+            os.remove(self._path(f"ivf-{previous_ivf}.npz"))
+
+    def save(self):
+        """
+        Appends the rows added since the last save to the index on disk as a new segment,
+        after picking up the segments other processes appended; older segments are left as they are.
+        """
+        with self._lock, self._file_lock():
+            self._sync(self._read_manifest())
+            if not self._pending and not self._ivf_dirty:
+                return
+            if self._pending:
+                self._write_segment()
+            self._write_manifest()
+            if len(self.segments) > MAX_SEGMENTS or len(self._deleted) > COMPACT_DELETED_FRACTION * len(self.meta):
+                self._compact_locked()
+
+    def compact(self):
+        """Rewrites every live row into a single segment, dropping replaced rows (O(rows), so only run occasionally)."""
+        with self._lock, self._file_lock():
+            self._sync(self._read_manifest())
+            if self._pending:
+                self._write_segment()
+            self._compact_locked()
+
+    def _compact_locked(self):
+        live = np.array([i for i in range(len(self.meta)) if i not in self._deleted], dtype=np.int64)
+        old_files = [name for seg in self.segments for name in seg["files"]]
+        metas = [dict(self.meta[i], id=new_id) for new_id, i in enumerate(live)]
+        rows = self._stored_rows(live) if len(live) else None
+        assignments = self.assignments[live] if self.assignments is not None else None
+
+        self.meta, self.segments, self._deleted, self._rows_by_key = [], [], set(), {}
+        for meta in metas:
+            self._track(meta)
+        if len(live):
+            self._pending = [row[None, :] for row in rows]
+            self._write_segment()
+        if assignments is not None:
+            self._set_ivf(self.centroids, assignments)
+            self._ivf_dirty = True
+        self._write_manifest()
+        # Processes that still map the old files keep reading them until they see the new manifest.
+        kept = {name for seg in self.segments for name in seg["files"]}
+        for name in old_files:
+            if name not in kept and os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+
+    # --- Updates ---
+    def add(self, vectors, metas):
+        """
+        Adds embedding rows with their metadata. A row whose (url, chunk) is already indexed
+        replaces the old one. Rows are searchable immediately, persisted on save().
+        """
+        rows = _normalize(vectors)
+        if len(rows) != len(metas):
+            raise ValueError("Expected one metadata entry per vector.")
+        with self._lock:
+            self._append_rows(rows, metas)
+
+    def add_texts(self, texts, metas):
+        """
+        Embeds texts and adds them; returns the number of rows added. Texts whose
+        (url, chunk) is already indexed with the same content are not embedded again.
+        """
+        texts, metas = list(texts), list(metas)
+        with self._lock:
+            changed = []
+            for text, meta in zip(texts, metas):
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+                row = self._rows_by_key.get((meta.get("url"), meta.get("chunk")))
+                if row is None or self.meta[row].get("digest") != digest:
+                    changed.append((text, dict(meta, digest=digest)))
+        if not changed:
+            return 0
+        self.add(encode_texts([text for text, _ in changed]), [meta for _, meta in changed])
+        return len(changed)
+
+    # --- IVF Partitioning ---
+    def _set_ivf(self, centroids, assignments):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.assignments = np.asarray(assignments, dtype=np.int32)
+        order = np.argsort(self.assignments, kind="stable")
+        bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+
+    def build_ivf(self, n_lists=None, iterations=10, sample_size=50000, seed=0):
+        """Clusters the stored rows with spherical k-means so queries only scan nearby lists."""
+        with self._lock:
+            matrix = self._all_rows()
+            n_rows = len(matrix)
+            if n_rows == 0:
+                return
+            n_lists = n_lists or max(1, int(np.sqrt(n_rows)))
+            rng = np.random.default_rng(seed)
+            sample = matrix[rng.choice(n_rows, size=min(sample_size, n_rows), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=min(n_lists, len(sample)), replace=False)]
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for i in range(len(centroids)):
+                    members = sample[labels == i]
+                    if len(members):
+                        centroids[i] = members.mean(axis=0)
+                centroids = _normalize(centroids)
+            assignments = np.concatenate([
+                np.argmax(matrix[start:start + SEARCH_BLOCK_ROWS] @ centroids.T, axis=1)
+                for start in range(0, n_rows, SEARCH_BLOCK_ROWS)
+            ])
+            self._set_ivf(centroids, assignments)
+            self._ivf_dirty = True
+
+    # --- Queries ---
+    def _segment_rows(self, seg, local_rows):
+        block = np.asarray(seg["vectors"][local_rows], dtype=np.float32)
+        if self.dtype == "int8":
+            block = block * np.asarray(seg["scales"][local_rows], dtype=np.float32)[:, None]
+        return block
+
+    def _stored_rows(self, rows=None):
+        """Dequantizes stored rows (all, or an array of row numbers) to float32."""
+        if not self.segments:
+            return np.zeros((0, 0), dtype=np.float32)
+        if rows is None:
+            return np.vstack([self._segment_rows(seg, slice(None)) for seg in self.segments])
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = np.array([seg["start"] for seg in self.segments])
+        owner = np.searchsorted(starts, rows, side="right") - 1
+        block = None
+        for i, seg in enumerate(self.segments):
+            mask = owner == i
+            if mask.any():
+                part = self._segment_rows(seg, rows[mask] - seg["start"])
+                if block is None:
+                    block = np.empty((len(rows), part.shape[1]), dtype=np.float32)
+                block[mask] = part
+        return block
+
+    def _all_rows(self):
+        stored = self._stored_rows()
+        if self._pending:
+            pending = np.vstack(self._pending)
+            return np.vstack([stored, pending]) if len(stored) else pending
+        return stored
+
+    def _score_rows(self, query, rows):
+        """Scores row numbers (stored or pending) against the query."""
+        n_stored = self.n_stored
+        stored = rows[rows < n_stored]
+        pending = rows[rows >= n_stored] - n_stored
+        scores = [self._stored_rows(stored) @ query] if len(stored) else []
+        if len(pending):
+            scores.append(np.vstack([self._pending[i] for i in pending]) @ query)
+        return np.concatenate(scores) if scores else np.zeros(0, dtype=np.float32)
+
+    def search_vector(self, query_vector, top_k=10, n_probe=8):
+        """Returns [(score, meta)] for the top_k rows closest to the query vector by cosine similarity."""
+        query = _normalize(query_vector)[0]
+        self.refresh()
+        with self._lock:
+            if len(self) == 0:
+                return []
+            if self.centroids is not None:
+                probes = np.argsort(self.centroids @ query)[::-1][:n_probe]
+                candidates = np.concatenate([self._lists[i] for i in probes])
+                candidates = np.sort(candidates)  # stored rows first, then pending, as _score_rows returns them
+                if self._deleted:
+                    candidates = candidates[~np.isin(candidates, list(self._deleted))]
+                scores = self._score_rows(query, candidates)
+            else:
+                # Brute force over contiguous slices, which the memory map serves without copying.
+                candidates = np.arange(len(self.meta))
+                blocks = [
+                    self._segment_rows(seg, slice(start, start + SEARCH_BLOCK_ROWS)) @ query
+                    for seg in self.segments
+                    for start in range(0, len(seg["vectors"]), SEARCH_BLOCK_ROWS)
+                ]
+                if self._pending:
+                    blocks.append(np.vstack(self._pending) @ query)
+                scores = np.concatenate(blocks)
+                if self._deleted:
+                    live = np.ones(len(candidates), dtype=bool)
+                    live[list(self._deleted)] = False
+                    candidates, scores = candidates[live], scores[live]
+            if len(scores) == 0:
+                return []
+            k = min(top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(float(scores[i]), self.meta[int(candidates[i])]) for i in top]
+
+    def search(self, query, top_k=10, n_probe=8):
+        """Embeds a text query and returns the top_k most similar rows as [(score, meta)]."""
+        return self.search_vector(encode_texts([query])[0], top_k=top_k, n_probe=n_probe)
+
+    def __len__(self):
+        return len(self.meta) - len(self._deleted)
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_vector_index():
+    """Returns the process-wide vector index, memory-mapping it from disk on first use (later saves are picked up by search())."""
+    global _default_index
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                _default_index = VectorIndex()
+    return _default_index
+
+
+def index_document_vectors(documents, text_by_url=None, force=False, save=True):
+    """
+    Embeds scraped abstracts and chunks of extracted PDF text into the default vector index.
+    Does nothing unless SEMANTIC_INDEXING is enabled or force=True. Problems are reported,
+    never raised, so scraping is not interrupted.
+    """
+    if not (SEMANTIC_INDEXING or force):
+        return
+    try:
+        index = get_default_vector_index()
+        text_by_url = text_by_url or {}
+        texts, metas = [], []
+        for doc in documents:
+            url, title = doc["url"], doc.get("title", "")
+            abstract = doc.get("abstract", "")
+            if abstract and not abstract.startswith(("No abstract", "An error occurred")):
+                texts.append(f"{title}. {abstract}" if title else abstract)
+                metas.append({"url": url, "title": title, "chunk": "abstract", "text": abstract[:300]})
+            for i, chunk in enumerate(chunk_words(text_by_url.get(url, ""))):
+                texts.append(chunk)
+                metas.append({"url": url, "title": title, "chunk": i, "text": chunk[:300]})
+        index.add_texts(texts, metas)
+        if index.centroids is None and len(index) >= IVF_MIN_ROWS:
+            index.build_ivf()
+        if save:
+            index.save()
+    except Exception as e:
+        print(f"⚠️ Could not update the local vector index: {e}")
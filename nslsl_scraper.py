@@ -1,74 +1,168 @@
+import atexit
 import os
 import re
-import requests
+import threading
+import lxml.html
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from engine.http_client import get_default_client as get_http_client
+from engine.downloads import get_default_manager as get_download_manager
+from engine.driver_pool import WebDriverPool, lease_driver
+from engine.processing import extract_text_from_pdf_bytes
+from engine.search_index import index_documents
 
-def scrape_nslsl_search_results(driver, search_term, limit=5):
+# Can be pointed at a local stand-in server (e.g. serving saved HTML fixtures).
+NSLSL_SEARCH_URL = os.environ.get("NSLSL_SEARCH_URL", "https://extapps.ksc.nasa.gov/NSLSL/Search")
+# Number of document detail pages fetched in parallel over HTTP.
+ABSTRACT_FETCH_WORKERS = 8
+# PDFs opened from the dashboard are indexed on this single background thread, one after another,
+# so text extraction and the index saves never hold up the page.
+_index_executor = None
+_index_executor_lock = threading.Lock()
+
+def search_nslsl_http(search_term, limit=5, search_url=None):
+    """
+    Submits the NSLSL search form directly over HTTP and parses the result links from the
+    returned HTML, without starting a browser.
+
+    Returns:
+        list | None: [{'title': ..., 'url': ...}], or None if the form or the results could
+        not be found in the server-rendered HTML (the caller should then use the browser).
+    """
+    client = get_http_client()
+    search_url = search_url or NSLSL_SEARCH_URL
+
+    page = client.get(search_url, label='nslsl.search_form', timeout=15)
+    page.raise_for_status()
+    tree = lxml.html.fromstring(page.content, base_url=page.url)
+    forms = tree.xpath("//form[.//input[@id='searchCriteria']]")
+    if not forms:
+        return None
+    form = forms[0]
+
+    # Keep hidden fields such as anti-forgery tokens, then fill in the search box.
+    fields = dict(form.form_values())
+    search_box = form.xpath(".//input[@id='searchCriteria']")[0]
+    fields[search_box.get('name') or 'searchCriteria'] = search_term
+    search_button = form.xpath(".//*[@id='btnSearchSimple'][@name]")
+    if search_button:
+        fields[search_button[0].get('name')] = search_button[0].get('value', '')
+
+    action = urljoin(page.url, form.get('action') or search_url)
+    if (form.get('method') or 'get').lower() == 'post':
+        response = client.post(action, label='nslsl.search', data=fields, timeout=20)
+    else:
+        response = client.get(action, label='nslsl.search', params=fields, timeout=20)
+    response.raise_for_status()
+
+    results = lxml.html.fromstring(response.content, base_url=response.url)
+    links = results.xpath("//*[@id='searchResultList']//a[contains(concat(' ', normalize-space(@class), ' '), ' pubDetail ')]")
+    if not links:
+        return None
+
+    documents = []
+    for link in links[:limit]:
+        title = link.text_content().strip()
+        href = link.get('href')
+        if title and href:
+            documents.append({"title": title, "url": urljoin(response.url, href)})
+    return documents
+
+def scrape_nslsl_search_results(driver, search_term, limit=5, use_http=True, raise_errors=False):
     """
     Performs a search on the NSLSL database and returns a list of document titles and their detail page URLs.
     This version does NOT scrape abstracts initially to speed up the search result display.
+    The browserless HTTP search is tried first; the browser is only used if it finds nothing.
+    `driver` may be a WebDriver or a WebDriverPool, in which case a browser is leased for the search.
+    A failed search returns [] unless raise_errors is set, in which case the error is raised so
+    callers can tell it apart from a search without results.
     """
-    search_url = "https://extapps.ksc.nasa.gov/NSLSL/Search"
-    try:
-        print(f"Navigating to search page for term: '{search_term}'")
-        driver.get(search_url)
-        wait = WebDriverWait(driver, 20)
+    if use_http:
+        try:
+            documents = search_nslsl_http(search_term, limit)
+            if documents is not None:
+                print(f"Found {len(documents)} documents (HTTP search).")
+                return documents
+            print("HTTP search returned no parsable results, falling back to the browser...")
+        except Exception as e:
+            print(f"⚠️ HTTP search failed, falling back to the browser: {e}")
+
+    # Selenium is only imported once a browser is actually needed.
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+
+    search_url = NSLSL_SEARCH_URL
+    with lease_driver(driver) as driver:
+        try:
+            print(f"Navigating to search page for term: '{search_term}'")
+            driver.get(search_url)
+            wait = WebDriverWait(driver, 20)
         
-        # Wait for the search box and button to be ready
-        search_box = wait.until(EC.presence_of_element_located((By.ID, "searchCriteria")))
-        search_button = wait.until(EC.element_to_be_clickable((By.ID, "btnSearchSimple")))
-
-        # Perform the search
-        search_box.clear()
-        search_box.send_keys(search_term)
-        print("Clicking search button...")
-        search_button.click()
+            # Wait for the search box and button to be ready
+            search_box = wait.until(EC.presence_of_element_located((By.ID, "searchCriteria")))
+            search_button = wait.until(EC.element_to_be_clickable((By.ID, "btnSearchSimple")))
+
+            # Perform the search
+            search_box.clear()
+            search_box.send_keys(search_term)
+            print("Clicking search button...")
+            search_button.click()
         
-        # Wait for the results to load by looking for the results count text
-        print("Waiting for search results to load...")
-        wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(text(), 'results')]")))
+            # Wait for the results to load by looking for the results count text
+            print("Waiting for search results to load...")
+            wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(text(), 'results')]")))
         
-        # Find the container for the results and extract links
-        results_container = driver.find_element(By.ID, "searchResultList")
-        result_links = results_container.find_elements(By.CLASS_NAME, "pubDetail")
+            # Find the container for the results and extract links
+            results_container = driver.find_element(By.ID, "searchResultList")
+            result_links = results_container.find_elements(By.CLASS_NAME, "pubDetail")
         
-        documents = []
-        for link_element in result_links[:limit]:
-            title = link_element.text.strip()
-            url = link_element.get_attribute('href')
-            if title and url:
-                documents.append({"title": title, "url": url})
+            documents = []
+            for link_element in result_links[:limit]:
+                title = link_element.text.strip()
+                url = link_element.get_attribute('href')
+                if title and url:
+                    documents.append({"title": title, "url": url})
         
-        print(f"Found {len(documents)} documents.")
-        return documents
+            print(f"Found {len(documents)} documents.")
+            return documents
 
-    except TimeoutException:
-        print(f"⚠️ Timed out waiting for search results for '{search_term}'. The page might have no results or loaded too slowly.")
-        return []
-    except Exception as e:
-        print(f"❌ An unexpected error occurred during search: {e}")
-        # Save a screenshot for debugging if something goes wrong
-        driver.save_screenshot('debug_error_search.png')
-        return []
+        except TimeoutException:
+            print(f"⚠️ Timed out waiting for search results for '{search_term}'. The page might have no results or loaded too slowly.")
+            if raise_errors:
+                raise
+            return []
+        except Exception as e:
+            print(f"❌ An unexpected error occurred during search: {e}")
+            # Save a screenshot for debugging if something goes wrong
+            driver.save_screenshot('debug_error_search.png')
+            if raise_errors:
+                raise
+            return []
 
-def get_abstracts_from_results(driver, documents):
+def _fetch_abstract_http(doc_url):
     """
-    Takes a list of documents (with URLs) and scrapes the abstract for each one.
-    
-    Args:
-        driver: The Selenium WebDriver instance.
-        documents (list): A list of dictionaries, e.g., [{'title': '...', 'url': '...'}]
-
-    Returns:
-        list: The updated list of dictionaries, with an 'abstract' key added to each.
+    Fetches a document detail page over plain HTTP and returns the abstract if it is
+    present in the server-rendered HTML, or None if the page needs a browser.
     """
-    print(f"Scraping abstracts for {len(documents)} documents...")
-    for doc in documents:
+    response = get_http_client().get(doc_url, label='nslsl.detail', timeout=15)
+    response.raise_for_status()
+    tree = lxml.html.fromstring(response.content)
+    for element in tree.xpath("//span[starts-with(@id, 'abstract-')]"):
+        text = element.text_content().strip()
+        if text:
+            return text
+    return None
+
+def _scrape_abstract_with_driver(driver, doc):
+    """Loads a document page in the browser (leased from the pool if given one) and stores its abstract."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    with lease_driver(driver) as driver:
         try:
             driver.get(doc['url'])
             abstract_wait = WebDriverWait(driver, 10)
@@ -83,50 +177,174 @@ def get_abstracts_from_results(driver, documents):
         except Exception as e:
             doc['abstract'] = f"An error occurred while scraping abstract: {e}"
             print(f"❌ Error scraping abstract for: {doc['title']}")
+
+def get_abstracts_from_results(driver, documents, max_workers=ABSTRACT_FETCH_WORKERS, save_index=True):
+    """
+    Takes a list of documents (with URLs) and scrapes the abstract for each one.
+    Detail pages are first fetched concurrently over plain HTTP; only documents whose
+    abstract is not in the server-rendered HTML are loaded in the browser.
+    
+    Args:
+        driver: The Selenium WebDriver instance, or a WebDriverPool to lease browsers from.
+        documents (list): A list of dictionaries, e.g., [{'title': '...', 'url': '...'}]
+        max_workers (int): Maximum number of detail pages fetched at the same time.
+        save_index (bool): Write the search indexes to disk right away; bulk callers pass
+            False and save once per batch.
+
+    Returns:
+        list: The updated list of dictionaries, with an 'abstract' key added to each.
+    """
+    print(f"Scraping abstracts for {len(documents)} documents...")
+    if not documents:
+        return documents
+
+    needs_browser = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(documents))) as pool:
+        futures = {pool.submit(_fetch_abstract_http, doc['url']): doc for doc in documents}
+        for future in as_completed(futures):
+            doc = futures[future]
+            try:
+                abstract_text = future.result()
+            except Exception as e:
+                print(f"⚠️ HTTP fetch failed for '{doc['title']}', falling back to browser: {e}")
+                abstract_text = None
+            if abstract_text:
+                doc['abstract'] = abstract_text
+                print(f"✅ Fetched abstract for: {doc['title']}")
+            else:
+                needs_browser.append(doc)
+
+    # Pages that render their abstract with JavaScript still need a browser; with a pool
+    # they are spread across its drivers, with a single driver they are loaded in turn.
+    if needs_browser:
+        browser_workers = driver.max_size if isinstance(driver, WebDriverPool) else 1
+        with ThreadPoolExecutor(max_workers=min(browser_workers, len(needs_browser))) as pool:
+            list(pool.map(lambda doc: _scrape_abstract_with_driver(driver, doc), needs_browser))
+
+    index_documents(documents, save=save_index)
+    _index_vectors(documents, save=save_index)
     return documents
 
 
-def download_nslsl_pdf(driver, doc_url, save_dir='downloads'):
+def _index_vectors(documents, text_by_url=None, save=True):
+    """The vector index pulls in numpy, so it is only imported when documents are first indexed."""
+    from engine.vector_index import index_document_vectors
+    index_document_vectors(documents, text_by_url=text_by_url, save=save)
+
+def _index_pdf(doc_url, pdf_bytes, save=True):
+    """Adds the text of a downloaded PDF to the local search index entry of its document."""
+    try:
+        text = extract_text_from_pdf_bytes(pdf_bytes)
+    except Exception as e:
+        print(f"⚠️ Could not extract text for indexing: {e}")
+        return
+    index_documents([{"url": doc_url}], text_by_url={doc_url: text}, save=save)
+    _index_vectors([{"url": doc_url}], text_by_url={doc_url: text}, save=save)
+
+def _index_pdf_in_background(doc_url, pdf_bytes):
+    """Queues _index_pdf on the background indexing thread and returns immediately."""
+    global _index_executor
+    if _index_executor is None:
+        with _index_executor_lock:
+            if _index_executor is None:
+                _index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-index")
+                atexit.register(_index_executor.shutdown, wait=True)
+    return _index_executor.submit(_index_pdf, doc_url, pdf_bytes)
+
+def _find_pdf_link(driver, doc_url):
     """
-    Navigates a document detail page and downloads the associated PDF file.
+    Opens a document detail page in a leased browser and returns (pdf_url, pdf_name), or
+    (None, None) if the page loaded but has no attachment. Raises if the page did not load.
     """
-    if not os.path.exists(save_dir):
-        os.makedirs(save_dir)
-    try:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    with lease_driver(driver) as driver:
         print(f"Navigating to document page: {doc_url}")
         driver.get(doc_url)
         wait = WebDriverWait(driver, 15)
-        
+
         # The selector for the PDF attachment link
         attachment_selector = (By.CSS_SELECTOR, "a[href*='/NSLSL/Search/Download/']")
-        attachment_element = wait.until(EC.presence_of_element_located(attachment_selector))
-        
+        try:
+            attachment_element = wait.until(EC.presence_of_element_located(attachment_selector))
+        except TimeoutException:
+            # A rendered detail page (it always has an abstract span) without a link has no attachment.
+            if driver.find_elements(By.CSS_SELECTOR, "span[id^='abstract-']"):
+                return None, None
+            raise
+
         # Construct the full, absolute URL for the PDF
         pdf_link = urljoin(doc_url, attachment_element.get_attribute('href'))
         print(f"Found PDF link: {pdf_link}")
 
-        # Use requests to download the file to avoid browser-specific download dialogs
-        response = requests.get(pdf_link, timeout=30)
-        response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-
         # Sanitize the filename to remove characters invalid for file systems
         raw_name = attachment_element.text.strip()
-        pdf_name = re.sub(r'[\\/*?:"<>|]', "", raw_name) or "NSLSL_Document.pdf"
-        if not pdf_name.lower().endswith('.pdf'):
-            pdf_name += '.pdf'
-        pdf_path = os.path.join(save_dir, pdf_name)
-        
-        # Write the content to a local file
-        with open(pdf_path, "wb") as f:
-            f.write(response.content)
-            
-        print(f"✅ Download complete: {pdf_path}")
-        return pdf_path
+    pdf_name = re.sub(r'[\\/*?:"<>|]', "", raw_name) or "NSLSL_Document.pdf"
+    if not pdf_name.lower().endswith('.pdf'):
+        pdf_name += '.pdf'
+    return pdf_link, pdf_name
 
+def _download_pdf(driver, doc_url, save_dir=None, raise_errors=False):
+    """
+    Streams a document's PDF to disk through the shared download manager and returns
+    (pdf_name, pdf_path), or (None, None) if the document has no attachment or, unless
+    raise_errors is set, the download failed. Without save_dir the file goes to the
+    manager's cache, keyed by URL, so repeat downloads are conditional re-fetches.
+    """
+    from selenium.common.exceptions import TimeoutException
+    try:
+        pdf_link, pdf_name = _find_pdf_link(driver, doc_url)
+        if pdf_link is None:
+            print(f"ℹ️ No PDF attachment on page: {doc_url}")
+            return None, None
+        manager = get_download_manager()
+        dest_path = os.path.join(save_dir, pdf_name) if save_dir else manager.cache_path(pdf_link, suffix=".pdf")
+        pdf_path = manager.download(pdf_link, dest_path, label="nslsl.pdf", timeout=30)
+        print(f"✅ Download complete: {pdf_path}")
+        return pdf_name, pdf_path
     except TimeoutException:
         print(f"⚠️ Timed out waiting for the download link on page: {doc_url}")
-        return None
+        if raise_errors:
+            raise
+        return None, None
     except Exception as e:
         print(f"❌ An error occurred while downloading the PDF: {e}")
-        return None
+        if raise_errors:
+            raise
+        return None, None
 
+def fetch_nslsl_pdf(driver, doc_url):
+    """
+    Returns (pdf_name, pdf_bytes) for a document's PDF, or (None, None) on failure.
+    The file is read once from the download cache and the bytes are passed on without further copies;
+    the PDF is added to the search indexes in the background.
+    `driver` may be a WebDriver or a WebDriverPool, in which case a browser is leased for the page.
+    """
+    pdf_name, pdf_path = _download_pdf(driver, doc_url)
+    if pdf_path is None:
+        return None, None
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+    _index_pdf_in_background(doc_url, pdf_bytes)
+    return pdf_name, pdf_bytes
+
+def download_nslsl_pdf(driver, doc_url, save_dir='downloads', save_index=True, raise_errors=False):
+    """
+    Navigates a document detail page and downloads the associated PDF file.
+    `driver` may be a WebDriver or a WebDriverPool, in which case a browser is leased for the page.
+    The PDF is indexed and saved in the background; with save_index=False it is instead indexed
+    in memory before returning, for batch callers that save the indexes themselves.
+    Returns None if the document has no attachment; download errors also return None
+    unless raise_errors is set.
+    """
+    pdf_name, pdf_path = _download_pdf(driver, doc_url, save_dir, raise_errors=raise_errors)
+    if pdf_path is not None:
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+        if save_index:
+            _index_pdf_in_background(doc_url, pdf_bytes)
+        else:
+            _index_pdf(doc_url, pdf_bytes, save=False)
+    return pdf_path